@@ -187,8 +187,8 @@ async def main():
     )
     analyze_parser.add_argument(
         '--checkpointer',
-        choices=['memory', 'postgres'],
-        help='Which checkpointer to use for the graph (memory|postgres)'
+        choices=['memory', 'sqlite', 'postgres'],
+        help='Which checkpointer to use for the graph (memory|sqlite|postgres)'
     )
     
     # Health check command
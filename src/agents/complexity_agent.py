@@ -138,7 +138,8 @@ class ComplexityAgent:
             analysis_run_id: ID of the analysis run
         """
         try:
-            # Store complexity hotspots as pain points
+            # Collect complexity hotspots, then persist in a single transaction
+            entries = []
             for hotspot_data in result.hotspots:
                 file_path = hotspot_data['file']
                 func = hotspot_data['function']
@@ -153,13 +154,12 @@ class ComplexityAgent:
                     f"Nesting depth: {func['nesting_depth']}"
                 )
 
-                pain_point = self.storage.create_pain_point(
-                    analysis_run_id=analysis_run_id,
-                    type="complexity_hotspot",
-                    severity=severity,
-                    description=description,
-                    confidence_score=0.9,  # High confidence for static analysis
-                    metadata={
+                entries.append({
+                    'pain_type': "complexity_hotspot",
+                    'severity': severity,
+                    'description': description,
+                    'confidence_score': 0.9,  # High confidence for static analysis
+                    'raw_context': {
                         'file': file_path,
                         'function': func['name'],
                         'line_number': func['line_number'],
@@ -167,16 +167,11 @@ class ComplexityAgent:
                         'cognitive_complexity': func['cognitive_complexity'],
                         'nesting_depth': func['nesting_depth'],
                         'rank': func['rank'],
-                    }
-                )
+                    },
+                    'recommendations': self._generate_recommendations(func),
+                })
 
-                # Add recommendations
-                recommendations = self._generate_recommendations(func)
-                for rec in recommendations:
-                    self.storage.create_recommendation(
-                        pain_point_id=pain_point.id,
-                        action=rec,
-                    )
+            self.storage.bulk_create_pain_points(analysis_run_id, entries)
 
             logger.info(
                 f"Persisted {len(result.hotspots)} complexity hotspots "
@@ -6,6 +6,14 @@ Enhanced output generation with multiple format support and storage integration
 import os
 import json
 import logging
+import itertools
+
+# orjson serializes payloads several times faster than stdlib json and
+# returns bytes directly; fall back to the stdlib when it is not installed
+try:
+    import orjson
+except Exception:
+    orjson = None
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Any, Optional
@@ -16,6 +24,17 @@ from src.models.model_manager import ModelManager
 
 logger = logging.getLogger(__name__)
 
+
+def _dump_json_bytes(payload: Any) -> bytes:
+    """Serialize a payload to indented JSON bytes, preferring orjson"""
+    if orjson is not None:
+        return orjson.dumps(
+            payload,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            default=str,
+        )
+    return json.dumps(payload, indent=2, default=str).encode('utf-8')
+
 @dataclass
 class OutputConfig:
     """Configuration for output generation"""
@@ -25,6 +44,7 @@ class OutputConfig:
     generate_mermaid: bool = True
     generate_json: bool = False
     compress_outputs: bool = False
+    write_agent_logs: bool = True
 
 @dataclass
 class ReportData:
@@ -51,8 +71,16 @@ class OutputAgent:
             generate_markdown=output_config.get('generate_markdown', True),
             generate_mermaid=output_config.get('generate_mermaid', True),
             generate_json=output_config.get('generate_json', False),
-            compress_outputs=output_config.get('compress_outputs', False)
+            compress_outputs=output_config.get('compress_outputs', False),
+            write_agent_logs=output_config.get('write_agent_logs', True)
         )
+
+        # Callers can check this before building log content at all
+        self.log_enabled = self.output_config.write_agent_logs
+
+        # Monotonic sequence for log filenames; next() advances atomically
+        # under the GIL, so concurrent writers need no lock to stay unique
+        self._log_seq = itertools.count()
         
         # Ensure output directories exist
         self.output_dir = Path(self.output_config.output_directory)
@@ -73,16 +101,37 @@ class OutputAgent:
         safe_repo = repo_name.replace('/', '__')
         agent_dir = self.agent_logs_root / agent_name / date_dir
         agent_dir.mkdir(parents=True, exist_ok=True)
-        md_path = agent_dir / f"{stamp}__{safe_repo}.md"
+        # The stamp has 1-second resolution; the sequence number keeps two
+        # writes for the same agent/repo within a second from clobbering
+        seq = next(self._log_seq)
+        md_path = agent_dir / f"{stamp}__{safe_repo}__{seq:04d}.md"
         with open(md_path, 'w', encoding='utf-8') as f:
             f.write(content)
         if json_payload is not None:
-            json_path = agent_dir / f"{stamp}__{safe_repo}.json"
-            with open(json_path, 'w', encoding='utf-8') as jf:
-                json.dump(json_payload, jf, indent=2)
+            json_path = agent_dir / f"{stamp}__{safe_repo}__{seq:04d}.json"
+            with open(json_path, 'wb') as jf:
+                jf.write(_dump_json_bytes(json_payload))
         logger.info(f"Wrote agent log: {md_path}")
         return str(md_path)
     
+    def write_agent_logs_batch(self, entries: List[Dict[str, Any]]) -> List[str]:
+        """Write several agent logs in one pass, sharing a single timestamp.
+
+        Each entry is a dict with agent_name, repo_name, content and an
+        optional json_payload, matching the write_agent_log signature.
+        """
+        ts = datetime.now(timezone.utc)
+        paths = []
+        for entry in entries:
+            paths.append(self.write_agent_log(
+                entry['agent_name'],
+                entry['repo_name'],
+                entry['content'],
+                timestamp=ts,
+                json_payload=entry.get('json_payload'),
+            ))
+        return paths
+
     def generate_analysis_report(
         self,
         analysis_run_id: int,
@@ -275,7 +324,7 @@ This automated analysis examined {len(data.repositories)} repositories and ident
             "workflow_stats": data.workflow_stats
         }
         
-        return json.dumps(json_data, indent=2)
+        return _dump_json_bytes(json_data).decode('utf-8')
     
     def _save_visualizations(self, visualizations: List[Dict[str, Any]], analysis_run_id: int) -> List[str]:
         """Save visualization files and return list of paths"""
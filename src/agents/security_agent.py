@@ -132,7 +132,8 @@ class SecurityAgent:
             report: Full vulnerability report
         """
         try:
-            # Store vulnerabilities as pain points
+            # Collect vulnerabilities, then persist in a single transaction
+            entries = []
             for vuln in report.vulnerabilities:
                 severity = self._map_severity_to_int(vuln.severity)
 
@@ -142,13 +143,12 @@ class SecurityAgent:
                     f"{vuln.title}"
                 )
 
-                pain_point = self.storage.create_pain_point(
-                    analysis_run_id=analysis_run_id,
-                    type="security_vulnerability",
-                    severity=severity,
-                    description=description,
-                    confidence_score=0.95,  # High confidence for known CVEs
-                    metadata={
+                entries.append({
+                    'pain_type': "security_vulnerability",
+                    'severity': severity,
+                    'description': description,
+                    'confidence_score': 0.95,  # High confidence for known CVEs
+                    'raw_context': {
                         'package_name': vuln.package_name,
                         'installed_version': vuln.installed_version,
                         'vulnerability_id': vuln.vulnerability_id,
@@ -158,14 +158,11 @@ class SecurityAgent:
                         'fixed_version': vuln.fixed_version,
                         'published_date': vuln.published_date,
                         'references': vuln.references,
-                    }
-                )
+                    },
+                    'recommendations': [vuln.fix_recommendation] if vuln.fix_recommendation else [],
+                })
 
-                # Add fix recommendation
-                self.storage.create_recommendation(
-                    pain_point_id=pain_point.id,
-                    action=vuln.fix_recommendation,
-                )
+            self.storage.bulk_create_pain_points(analysis_run_id, entries)
 
             logger.info(
                 f"Persisted {len(report.vulnerabilities)} vulnerabilities "
@@ -1,417 +1,674 @@
-"""
-Model Manager
-Enhanced model routing adapters for CCR Claude, GLM, MiniMax, and Ollama
-"""
-
-import os
-import json
-import time
-import logging
-import requests
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
-
-logger = logging.getLogger(__name__)
-
-@dataclass
-class ModelConfig:
-    """Configuration for a specific model"""
-    name: str
-    model: str
-    endpoint: Optional[str] = None
-    base_url: Optional[str] = None
-    max_tokens: Optional[int] = None
-    temperature: float = 0.3
-    timeout: int = 30
-    retries: int = 2
-    headers: Dict[str, str] = None
-
-@dataclass
-class ModelResponse:
-    """Standardized model response format"""
-    content: str
-    model: str
-    confidence: float = 0.8
-    tokens_used: int = 0
-    metadata: Dict[str, Any] = None
-
-class ModelManager:
-    """Enhanced model manager with better error handling and routing"""
-    
-    def __init__(self, config: Dict):
-        self.config = config
-        self.models = self._parse_model_configs(config.get('models', {}))
-        self.api_keys = self._parse_api_keys(config.get('api_keys', {}))
-        self.session = requests.Session()
-        self.default_model = config.get('agents', {}).get('pain_point_analyzer', {}).get('primary_model', 'glm_4_6')
-        
-    def _parse_model_configs(self, models_config: Dict) -> Dict[str, ModelConfig]:
-        """Parse model configurations into ModelConfig objects"""
-        parsed = {}
-        for key, cfg in models_config.items():
-            parsed[key] = ModelConfig(
-                name=key,
-                endpoint=cfg.get('endpoint'),
-                base_url=cfg.get('base_url'),
-                model=cfg.get('model', key),
-                max_tokens=cfg.get('max_tokens'),
-                temperature=cfg.get('temperature', 0.3),
-                timeout=cfg.get('timeout', 30),
-                retries=cfg.get('retries', 2)
-            )
-        return parsed
-    
-    def _parse_api_keys(self, api_keys_config: Dict) -> Dict[str, str]:
-        """Parse API keys using explicit provider mapping and env fallback"""
-        # Accept both provider-named keys and env vars mapped in ConfigLoader
-        merged = dict(api_keys_config)
-        # Merge env if present (pre-expanded by ConfigLoader)
-        for env_key in ['github_token','glm_api_key','minimax_api_key','openrouter_api_key','google_search_key']:
-            val = os.getenv(env_key.upper())
-            if val and not merged.get(env_key):
-                merged[env_key] = val
-        return merged
-    
-    def get_available_models(self) -> List[str]:
-        """Get list of available models"""
-        return list(self.models.keys())
-    
-    def is_model_available(self, model_name: str) -> bool:
-        """Check if a model is available"""
-        if model_name == 'ollama':
-            return model_name in self.models
-        if model_name == 'glm_4_6':
-            return model_name in self.models and bool(self.api_keys.get('glm_api_key'))
-        if model_name == 'minimax':
-            return model_name in self.models and bool(self.api_keys.get('minimax_api_key') or self.api_keys.get('openrouter_api_key'))
-        return model_name in self.models
-    
-    def call_model(self, model_name: str, prompt: str, data: Dict = None, 
-                  fallback_models: List[str] = None) -> ModelResponse:
-        """Call a specific model with fallback support"""
-        models_to_try = [model_name]
-        if fallback_models:
-            models_to_try.extend(fallback_models)
-        
-        last_error = None
-        for attempt_model in models_to_try:
-            if not self.is_model_available(attempt_model):
-                logger.warning(f"Model {attempt_model} not available, skipping")
-                continue
-            
-            try:
-                logger.info(f"Attempting to call model: {attempt_model}")
-                return self._call_specific_model(attempt_model, prompt, data)
-            except Exception as e:
-                logger.error(f"Model {attempt_model} call failed: {e}")
-                last_error = e
-                continue
-        
-        if last_error:
-            raise RuntimeError(f"All model attempts failed. Last error: {last_error}")
-    
-    def _call_specific_model(self, model_name: str, prompt: str, data: Dict = None) -> ModelResponse:
-        """Call a specific model by name"""
-        model_config = self.models.get(model_name)
-        if not model_config:
-            raise ValueError(f"Model configuration missing for {model_name}")
-        
-        api_key = None
-        if model_name == 'glm_4_6':
-            api_key = self.api_keys.get('glm_api_key')
-        elif model_name == 'minimax':
-            api_key = self.api_keys.get('minimax_api_key') or self.api_keys.get('openrouter_api_key')
-        elif model_name == 'ollama':
-            api_key = None
-        else:
-            api_key = self.api_keys.get(model_name)
-        if model_name != 'ollama' and not api_key:
-            raise ValueError(f"API key missing for {model_name}")
-        
-        # Route to specific model implementation
-        if model_name == 'glm_4_6':
-            return self._call_glm_4_6(model_config, api_key, prompt, data)
-        elif model_name == 'minimax':
-            return self._call_minimax(model_config, api_key, prompt, data)
-        elif model_name == 'ollama':
-            return self._call_ollama(model_config, prompt, data)
-        else:
-            # Generic API call
-            return self._call_generic_api(model_config, api_key, prompt, data)
-    
-    def _call_glm_4_6(self, config: ModelConfig, api_key: str, prompt: str, data: Dict = None) -> ModelResponse:
-        """Call GLM 4.6 model"""
-        endpoint = config.base_url or "https://open.bigmodel.cn/api/paas/v4/"
-        url = f"{endpoint.rstrip('/')}/chat/completions"
-        
-        payload = {
-            "model": config.model,
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": config.temperature,
-            "max_tokens": config.max_tokens or 4000
-        }
-        
-        if data:
-            payload["data"] = data
-        
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {api_key}"
-        }
-        
-        response = self._make_request("POST", url, headers, payload, config.timeout, config.retries)
-        return self._parse_response(response, "glm-4.6")
-    
-    def _call_minimax(self, config: ModelConfig, api_key: str, prompt: str, data: Dict = None) -> ModelResponse:
-        """Call MiniMax model"""
-        endpoint = config.base_url or "https://api.minimax.chat/v1/"
-        url = f"{endpoint.rstrip('/')}/text/chatcompletion_pro"
-        
-        payload = {
-            "model": config.model,
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": config.temperature,
-            "max_tokens": config.max_tokens or 2000
-        }
-        
-        if data:
-            payload["data"] = data
-        
-        headers = {"Content-Type": "application/json"}
-        if api_key:
-            headers["Authorization"] = f"Bearer {api_key}"
-        
-        response = self._make_request("POST", url, headers, payload, config.timeout, config.retries)
-        return self._parse_response(response, "minimax")
-    
-    def _call_ollama(self, config: ModelConfig, prompt: str, data: Dict = None) -> ModelResponse:
-        """Call Ollama model (local)"""
-        endpoint = config.base_url or "http://localhost:11434/v1/"
-        url = f"{endpoint.rstrip('/')}/chat/completions"
-        
-        payload = {
-            "model": config.model,
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": config.temperature,
-            "stream": False
-        }
-        
-        if data:
-            payload["data"] = data
-        
-        headers = {"Content-Type": "application/json"}
-        
-        response = self._make_request("POST", url, headers, payload, config.timeout, config.retries)
-        return self._parse_response(response, "ollama")
-    
-    def _call_generic_api(self, config: ModelConfig, api_key: str, prompt: str, data: Dict = None) -> ModelResponse:
-        """Generic API call for unknown models"""
-        url = config.endpoint or config.base_url
-        if not url:
-            raise ValueError(f"No endpoint specified for model {config.name}")
-        
-        payload = {
-            "model": config.model,
-            "prompt": prompt,
-            "temperature": config.temperature,
-            "max_tokens": config.max_tokens
-        }
-        
-        if data:
-            payload["data"] = data
-        
-        headers = {"Content-Type": "application/json"}
-        if api_key:
-            headers["Authorization"] = f"Bearer {api_key}"
-        
-        response = self._make_request("POST", url, headers, payload, config.timeout, config.retries)
-        return self._parse_response(response, config.name)
-    
-    def _make_request(self, method: str, url: str, headers: Dict[str, str], 
-                    payload: Dict, timeout: int, retries: int) -> Dict:
-        """Make HTTP request with retry logic"""
-        for attempt in range(retries):
-            try:
-                response = self.session.request(method, url, headers=headers, json=payload, timeout=timeout)
-                response.raise_for_status()
-                return response.json()
-            except requests.RequestException as exc:
-                logger.warning(f"Request attempt {attempt + 1}/{retries} failed: {exc}")
-                if attempt < retries - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
-                else:
-                    raise
-    
-    def _parse_response(self, response: Dict, model_label: str) -> ModelResponse:
-        """Parse standardized response from different APIs"""
-        if not response:
-            raise RuntimeError("Empty response received")
-        
-        # Extract content based on response format
-        content = None
-        tokens_used = 0
-        confidence = 0.8
-        
-        if 'choices' in response and response['choices']:
-            choice = response['choices'][0]
-            content = choice.get('message', {}).get('content') or choice.get('text')
-        elif 'output' in response:
-            content = response['output']
-        elif 'message' in response:
-            content = response['message']
-        elif 'data' in response:
-            content = response['data']
-        else:
-            # Fallback to string representation
-            content = str(response)
-        
-        # Extract usage information
-        if 'usage' in response:
-            usage = response['usage']
-            tokens_used = usage.get('total_tokens', usage.get('prompt_tokens', 0))
-        
-        # Try to extract confidence if available
-        if 'confidence' in response:
-            confidence = float(response['confidence'])
-        elif 'model_analysis' in response and isinstance(response['model_analysis'], dict):
-            confidence = response['model_analysis'].get('confidence', 0.8)
-        
-        if not content:
-            raise RuntimeError(f"Unable to extract content from {model_label} response")
-        
-        return ModelResponse(
-            content=content,
-            model=model_label,
-            confidence=confidence,
-            tokens_used=tokens_used,
-            metadata=response
-        )
-    
-    def analyze_pain_points(self, repository_data: Dict, pr_data: List[Dict] = None) -> ModelResponse:
-        """Analyze repository for pain points using default model"""
-        prompt = self._build_pain_point_prompt(repository_data, pr_data)
-        
-        # Try primary model first, then fallback
-        fallback_models = ['minimax', 'ollama']
-        return self.call_model(self.default_model, prompt, 
-                           data={"repository": repository_data, "pull_requests": pr_data},
-                           fallback_models=fallback_models)
-    
-    def _build_pain_point_prompt(self, repository_data: Dict, pr_data: List[Dict] = None) -> str:
-        """Build prompt for pain point analysis"""
-        prompt = f"""
-        Analyze the following repository for potential pain points and issues:
-        
-        Repository Information:
-        - Name: {repository_data.get('name', 'Unknown')}
-        - Owner: {repository_data.get('owner', 'Unknown')}
-        - Language: {repository_data.get('language', 'Unknown')}
-        - Health Score: {repository_data.get('health_score', 'Unknown')}
-        - Open PRs: {len(pr_data or [])}
-        
-        Recent Pull Requests:
-        """
-        
-        if pr_data:
-            for i, pr in enumerate(pr_data[:5], 1):  # Limit to first 5 PRs
-                prompt += f"""
-        PR #{i}: {pr.get('title', 'No title')}
-        - Author: {pr.get('author', 'Unknown')}
-        - State: {pr.get('state', 'Unknown')}
-        - Changes: +{pr.get('additions', 0)}/-{pr.get('deletions', 0)}
-        - Comments: {pr.get('review_comments', 0)}
-        - Mergeable: {pr.get('mergeable', 'Unknown')}
-                """
-        
-        prompt += """
-        
-        Please analyze this repository and identify:
-        1. Code quality issues
-        2. CI/CD problems
-        3. Merge conflicts or collaboration issues
-        4. Performance or scalability concerns
-        5. Security vulnerabilities
-        6. Documentation gaps
-        7. Testing deficiencies
-        
-        For each issue identified, provide:
-        - Type of issue
-        - Severity level (1-5, where 5 is most severe)
-        - Description of the problem
-        - Recommended solution approach
-        - Confidence score (0-1)
-        
-        Format your response as JSON with the following structure:
-        {
-            "pain_points": [
-                {
-                    "type": "issue_type",
-                    "severity": 1-5,
-                    "description": "detailed description",
-                    "recommendation": "solution approach",
-                    "confidence": 0.0-1.0
-                }
-            ],
-            "summary": "overall assessment",
-            "confidence": 0.0-1.0
-        }
-        """
-        
-        return prompt
-    
-    def generate_recommendations(self, pain_point: Dict) -> ModelResponse:
-        """Generate recommendations for a specific pain point"""
-        prompt = self._build_recommendation_prompt(pain_point)
-        
-        # Use lighter model for recommendations
-        return self.call_model('minimax', prompt, 
-                           fallback_models=['glm_4_6', 'ollama'])
-    
-    def _build_recommendation_prompt(self, pain_point: Dict) -> str:
-        """Build prompt for recommendation generation"""
-        prompt = f"""
-        Generate specific, actionable recommendations for the following pain point:
-        
-        Pain Point Details:
-        - Type: {pain_point.get('type', 'Unknown')}
-        - Severity: {pain_point.get('severity', 'Unknown')}/5
-        - Description: {pain_point.get('description', 'No description')}
-        - Current Confidence: {pain_point.get('confidence', 'Unknown')}
-        
-        Please provide:
-        1. 3-5 specific, actionable recommendations
-        2. Implementation priority (high/medium/low)
-        3. Estimated effort (hours/days)
-        4. Risk level if not addressed
-        5. Reference to best practices or documentation
-        
-        Format your response as JSON:
-        {
-            "recommendations": [
-                {
-                    "text": "specific recommendation",
-                    "priority": "high/medium/low",
-                    "effort": "time estimate",
-                    "risk": "risk level",
-                    "reference": "documentation link"
-                }
-            ],
-            "summary": "implementation strategy"
-        }
-        """
-        
-        return prompt
-    
-    def get_model_stats(self) -> Dict[str, Any]:
-        """Get usage statistics for all models"""
-        return {
-            "available_models": self.get_available_models(),
-            "default_model": self.default_model,
-            "model_configs": {name: {
-                "model": cfg.model,
-                "temperature": cfg.temperature,
-                "max_tokens": cfg.max_tokens,
-                "timeout": cfg.timeout
-            } for name, cfg in self.models.items()
-            }
+"""
+Model Manager
+Enhanced model routing adapters for CCR Claude, GLM, MiniMax, and Ollama
+"""
+
+import os
+import json
+import time
+import logging
+import hashlib
+import threading
+import requests
+from concurrent.futures import Future
+from string import Template
+from typing import Dict, List, Any, Optional
+from dataclasses import dataclass
+
+# Optional tokenizer for prompt budgeting; trimming falls back to a
+# character heuristic when tiktoken is not installed
+try:
+    import tiktoken
+except Exception:
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Cached cl100k_base encoder (lazy; encoder construction is expensive)
+_ENCODER = None
+
+# Token budgets for prompt interpolation
+PROMPT_FIELD_BUDGET = 300
+PR_FIELD_BUDGET = 150
+
+
+def _get_encoder():
+    """Return the cached tiktoken encoder, or None if unavailable"""
+    global _ENCODER, tiktoken
+    if _ENCODER is None and tiktoken is not None:
+        try:
+            _ENCODER = tiktoken.get_encoding("cl100k_base")
+        except Exception as exc:
+            # Encoding data may require a network fetch on first use
+            logger.warning(f"tiktoken encoder unavailable ({exc}); using character heuristic")
+            tiktoken = None
+    return _ENCODER
+
+
+def trim_to_token_budget(text: Optional[str], budget: int) -> str:
+    """Trim text to a token budget so large fields cannot blow past max_tokens"""
+    if not text:
+        return ''
+    encoder = _get_encoder()
+    if encoder is None:
+        # Rough heuristic: ~4 characters per token
+        return text[:budget * 4]
+    tokens = encoder.encode(text)
+    if len(tokens) <= budget:
+        return text
+    return encoder.decode(tokens[:budget])
+
+@dataclass
+class ModelConfig:
+    """Configuration for a specific model"""
+    name: str
+    model: str
+    endpoint: Optional[str] = None
+    base_url: Optional[str] = None
+    max_tokens: Optional[int] = None
+    temperature: float = 0.3
+    timeout: int = 30
+    retries: int = 2
+    headers: Dict[str, str] = None
+
+@dataclass
+class ModelResponse:
+    """Standardized model response format"""
+    content: str
+    model: str
+    confidence: float = 0.8
+    tokens_used: int = 0
+    metadata: Dict[str, Any] = None
+
+# Precompiled prompt templates. Building prompts from compiled Templates
+# avoids re-running f-string concatenation per call and keeps the static
+# prefix byte-identical across calls, which helps provider prompt caching.
+_PAIN_POINT_HEADER_TMPL = Template("""
+        Analyze the following repository for potential pain points and issues:
+
+        Repository Information:
+        - Name: $name
+        - Owner: $owner
+        - Language: $language
+        - Description: $description
+        - Health Score: $health_score
+        - Open PRs: $open_pr_count
+
+        Recent Pull Requests:
+        """)
+
+_PAIN_POINT_PR_TMPL = Template("""
+        PR #$index: $title
+        - Description: $description
+        - Author: $author
+        - State: $state
+        - Changes: +$additions/-$deletions
+        - Comments: $review_comments
+        - Mergeable: $mergeable
+                """)
+
+_PAIN_POINT_INSTRUCTIONS = """
+
+        Please analyze this repository and identify:
+        1. Code quality issues
+        2. CI/CD problems
+        3. Merge conflicts or collaboration issues
+        4. Performance or scalability concerns
+        5. Security vulnerabilities
+        6. Documentation gaps
+        7. Testing deficiencies
+
+        For each issue identified, provide:
+        - Type of issue
+        - Severity level (1-5, where 5 is most severe)
+        - Description of the problem
+        - Recommended solution approach
+        - Confidence score (0-1)
+
+        Format your response as JSON with the following structure:
+        {
+            "pain_points": [
+                {
+                    "type": "issue_type",
+                    "severity": 1-5,
+                    "description": "detailed description",
+                    "recommendation": "solution approach",
+                    "confidence": 0.0-1.0
+                }
+            ],
+            "summary": "overall assessment",
+            "confidence": 0.0-1.0
+        }
+        """
+
+_BATCH_REPO_HEADER_TMPL = Template("""
+        Repository $index: $owner/$name
+        - Language: $language
+        - Description: $description
+        - Health Score: $health_score
+        - Open PRs: $open_pr_count
+        """)
+
+_BATCH_INSTRUCTIONS = """
+
+        Analyze each repository above for pain points (code quality, CI/CD,
+        collaboration, performance, security, documentation, testing).
+
+        For each issue identified, provide:
+        - Type of issue
+        - Severity level (1-5, where 5 is most severe)
+        - Description of the problem
+        - Recommended solution approach
+        - Confidence score (0-1)
+
+        Format your response as JSON with one entry per repository, in the
+        same order they appear above:
+        {
+            "repositories": [
+                {
+                    "repository": "owner/name",
+                    "pain_points": [
+                        {
+                            "type": "issue_type",
+                            "severity": 1-5,
+                            "description": "detailed description",
+                            "recommendation": "solution approach",
+                            "confidence": 0.0-1.0
+                        }
+                    ],
+                    "summary": "overall assessment",
+                    "confidence": 0.0-1.0
+                }
+            ]
+        }
+        """
+
+_RECOMMENDATION_TMPL = Template("""
+        Generate specific, actionable recommendations for the following pain point:
+
+        Pain Point Details:
+        - Type: $type
+        - Severity: $severity/5
+        - Description: $description
+        - Current Confidence: $confidence
+
+        Please provide:
+        1. 3-5 specific, actionable recommendations
+        2. Implementation priority (high/medium/low)
+        3. Estimated effort (hours/days)
+        4. Risk level if not addressed
+        5. Reference to best practices or documentation
+
+        Format your response as JSON:
+        {
+            "recommendations": [
+                {
+                    "text": "specific recommendation",
+                    "priority": "high/medium/low",
+                    "effort": "time estimate",
+                    "risk": "risk level",
+                    "reference": "documentation link"
+                }
+            ],
+            "summary": "implementation strategy"
+        }
+        """)
+
+
+class ModelManager:
+    """Enhanced model manager with better error handling and routing"""
+    
+    def __init__(self, config: Dict):
+        self.config = config
+        self.models = self._parse_model_configs(config.get('models', {}))
+        self.api_keys = self._parse_api_keys(config.get('api_keys', {}))
+        self.session = requests.Session()
+        # The session is shared by concurrent gather workers; widen the
+        # per-host connection pool past urllib3's default of 10 so fan-out
+        # reuses keep-alive connections instead of re-handshaking TLS
+        pool_size = max(
+            config.get('orchestration', {}).get('langgraph', {}).get('max_concurrent_runs', 5) * 4,
+            10,
+        )
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.default_model = config.get('agents', {}).get('pain_point_analyzer', {}).get('primary_model', 'glm_4_6')
+
+        # In-flight request coalescing: identical concurrent calls share one result
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        
+    def _parse_model_configs(self, models_config: Dict) -> Dict[str, ModelConfig]:
+        """Parse model configurations into ModelConfig objects"""
+        parsed = {}
+        for key, cfg in models_config.items():
+            parsed[key] = ModelConfig(
+                name=key,
+                endpoint=cfg.get('endpoint'),
+                base_url=cfg.get('base_url'),
+                model=cfg.get('model', key),
+                max_tokens=cfg.get('max_tokens'),
+                temperature=cfg.get('temperature', 0.3),
+                timeout=cfg.get('timeout', 30),
+                retries=cfg.get('retries', 2)
+            )
+        return parsed
+    
+    def _parse_api_keys(self, api_keys_config: Dict) -> Dict[str, str]:
+        """Parse API keys using explicit provider mapping and env fallback"""
+        # Accept both provider-named keys and env vars mapped in ConfigLoader
+        merged = dict(api_keys_config)
+        # Merge env if present (pre-expanded by ConfigLoader)
+        for env_key in ['github_token','glm_api_key','minimax_api_key','openrouter_api_key','google_search_key']:
+            val = os.getenv(env_key.upper())
+            if val and not merged.get(env_key):
+                merged[env_key] = val
+        return merged
+    
+    def get_available_models(self) -> List[str]:
+        """Get list of available models"""
+        return list(self.models.keys())
+    
+    def is_model_available(self, model_name: str) -> bool:
+        """Check if a model is available"""
+        if model_name == 'ollama':
+            return model_name in self.models
+        if model_name == 'glm_4_6':
+            return model_name in self.models and bool(self.api_keys.get('glm_api_key'))
+        if model_name == 'minimax':
+            return model_name in self.models and bool(self.api_keys.get('minimax_api_key') or self.api_keys.get('openrouter_api_key'))
+        return model_name in self.models
+    
+    def _request_key(self, model_name: str, prompt: str) -> str:
+        """Build a coalescing key for an identical (model, prompt) request"""
+        digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        return f"{model_name}:{digest}"
+
+    def call_model(self, model_name: str, prompt: str, data: Dict = None,
+                  fallback_models: List[str] = None) -> ModelResponse:
+        """Call a specific model with fallback support, coalescing duplicate in-flight requests"""
+        key = self._request_key(model_name, prompt)
+
+        with self._inflight_lock:
+            existing = self._inflight.get(key)
+            if existing is None:
+                future: Future = Future()
+                self._inflight[key] = future
+
+        if existing is not None:
+            logger.info(f"Coalescing duplicate in-flight request for model {model_name}")
+            return existing.result()
+
+        try:
+            response = self._call_with_fallback(model_name, prompt, data, fallback_models)
+            future.set_result(response)
+            return response
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _call_with_fallback(self, model_name: str, prompt: str, data: Dict = None,
+                           fallback_models: List[str] = None) -> ModelResponse:
+        """Try the requested model, then each fallback in order"""
+        models_to_try = [model_name]
+        if fallback_models:
+            models_to_try.extend(fallback_models)
+        
+        last_error = None
+        for attempt_model in models_to_try:
+            if not self.is_model_available(attempt_model):
+                logger.warning(f"Model {attempt_model} not available, skipping")
+                continue
+            
+            try:
+                logger.info(f"Attempting to call model: {attempt_model}")
+                return self._call_specific_model(attempt_model, prompt, data)
+            except Exception as e:
+                logger.error(f"Model {attempt_model} call failed: {e}")
+                last_error = e
+                continue
+        
+        if last_error:
+            raise RuntimeError(f"All model attempts failed. Last error: {last_error}")
+    
+    def _call_specific_model(self, model_name: str, prompt: str, data: Dict = None) -> ModelResponse:
+        """Call a specific model by name"""
+        model_config = self.models.get(model_name)
+        if not model_config:
+            raise ValueError(f"Model configuration missing for {model_name}")
+        
+        api_key = None
+        if model_name == 'glm_4_6':
+            api_key = self.api_keys.get('glm_api_key')
+        elif model_name == 'minimax':
+            api_key = self.api_keys.get('minimax_api_key') or self.api_keys.get('openrouter_api_key')
+        elif model_name == 'ollama':
+            api_key = None
+        else:
+            api_key = self.api_keys.get(model_name)
+        if model_name != 'ollama' and not api_key:
+            raise ValueError(f"API key missing for {model_name}")
+        
+        # Route to specific model implementation
+        if model_name == 'glm_4_6':
+            return self._call_glm_4_6(model_config, api_key, prompt, data)
+        elif model_name == 'minimax':
+            return self._call_minimax(model_config, api_key, prompt, data)
+        elif model_name == 'ollama':
+            return self._call_ollama(model_config, prompt, data)
+        else:
+            # Generic API call
+            return self._call_generic_api(model_config, api_key, prompt, data)
+    
+    def _call_glm_4_6(self, config: ModelConfig, api_key: str, prompt: str, data: Dict = None) -> ModelResponse:
+        """Call GLM 4.6 model"""
+        endpoint = config.base_url or "https://open.bigmodel.cn/api/paas/v4/"
+        url = f"{endpoint.rstrip('/')}/chat/completions"
+        
+        payload = {
+            "model": config.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": config.temperature,
+            "max_tokens": config.max_tokens or 4000
+        }
+        
+        if data:
+            payload["data"] = data
+        
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}"
+        }
+        
+        response = self._make_request("POST", url, headers, payload, config.timeout, config.retries)
+        return self._parse_response(response, "glm-4.6")
+    
+    def _call_minimax(self, config: ModelConfig, api_key: str, prompt: str, data: Dict = None) -> ModelResponse:
+        """Call MiniMax model"""
+        endpoint = config.base_url or "https://api.minimax.chat/v1/"
+        url = f"{endpoint.rstrip('/')}/text/chatcompletion_pro"
+        
+        payload = {
+            "model": config.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": config.temperature,
+            "max_tokens": config.max_tokens or 2000
+        }
+        
+        if data:
+            payload["data"] = data
+        
+        headers = {"Content-Type": "application/json"}
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
+        
+        response = self._make_request("POST", url, headers, payload, config.timeout, config.retries)
+        return self._parse_response(response, "minimax")
+    
+    def _call_ollama(self, config: ModelConfig, prompt: str, data: Dict = None) -> ModelResponse:
+        """Call Ollama model (local)"""
+        endpoint = config.base_url or "http://localhost:11434/v1/"
+        url = f"{endpoint.rstrip('/')}/chat/completions"
+        
+        payload = {
+            "model": config.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": config.temperature,
+            "stream": False
+        }
+        
+        if data:
+            payload["data"] = data
+        
+        headers = {"Content-Type": "application/json"}
+        
+        response = self._make_request("POST", url, headers, payload, config.timeout, config.retries)
+        return self._parse_response(response, "ollama")
+    
+    def _call_generic_api(self, config: ModelConfig, api_key: str, prompt: str, data: Dict = None) -> ModelResponse:
+        """Generic API call for unknown models"""
+        url = config.endpoint or config.base_url
+        if not url:
+            raise ValueError(f"No endpoint specified for model {config.name}")
+        
+        payload = {
+            "model": config.model,
+            "prompt": prompt,
+            "temperature": config.temperature,
+            "max_tokens": config.max_tokens
+        }
+        
+        if data:
+            payload["data"] = data
+        
+        headers = {"Content-Type": "application/json"}
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
+        
+        response = self._make_request("POST", url, headers, payload, config.timeout, config.retries)
+        return self._parse_response(response, config.name)
+    
+    def _make_request(self, method: str, url: str, headers: Dict[str, str], 
+                    payload: Dict, timeout: int, retries: int) -> Dict:
+        """Make HTTP request with retry logic"""
+        for attempt in range(retries):
+            try:
+                response = self.session.request(method, url, headers=headers, json=payload, timeout=timeout)
+                response.raise_for_status()
+                return response.json()
+            except requests.RequestException as exc:
+                logger.warning(f"Request attempt {attempt + 1}/{retries} failed: {exc}")
+                if attempt < retries - 1:
+                    time.sleep(2 ** attempt)  # Exponential backoff
+                else:
+                    raise
+    
+    def _parse_response(self, response: Dict, model_label: str, strict: bool = False) -> ModelResponse:
+        """Parse standardized response from different APIs"""
+        if not response:
+            raise RuntimeError("Empty response received")
+        
+        # Extract content based on response format
+        content = None
+        tokens_used = 0
+        confidence = 0.8
+        
+        if 'choices' in response and response['choices']:
+            choice = response['choices'][0]
+            content = choice.get('message', {}).get('content') or choice.get('text')
+        elif 'output' in response:
+            content = response['output']
+        elif 'message' in response:
+            content = response['message']
+        elif 'data' in response:
+            content = response['data']
+        else:
+            # Fallback to string representation
+            content = str(response)
+        
+        # Extract usage information
+        if 'usage' in response:
+            usage = response['usage']
+            tokens_used = usage.get('total_tokens', usage.get('prompt_tokens', 0))
+        
+        # Try to extract confidence if available
+        if 'confidence' in response:
+            confidence = float(response['confidence'])
+        elif 'model_analysis' in response and isinstance(response['model_analysis'], dict):
+            confidence = response['model_analysis'].get('confidence', 0.8)
+        
+        if not content:
+            if strict:
+                raise RuntimeError(f"Unable to extract content from {model_label} response")
+            # Salvage a degraded response rather than forcing callers into the
+            # full fallback loop (and another timeout) on schema drift
+            logger.warning(f"Content keys missing in {model_label} response; returning degraded response")
+            return ModelResponse(
+                content=json.dumps(response)[:2000],
+                model=model_label,
+                confidence=0.1,
+                tokens_used=tokens_used,
+                metadata={"warning": "schema_mismatch", "raw_response": response},
+            )
+
+        return ModelResponse(
+            content=content,
+            model=model_label,
+            confidence=confidence,
+            tokens_used=tokens_used,
+            metadata=response
+        )
+    
+    def analyze_pain_points(self, repository_data: Dict, pr_data: List[Dict] = None) -> ModelResponse:
+        """Analyze repository for pain points using default model"""
+        prompt = self._build_pain_point_prompt(repository_data, pr_data)
+        
+        # Try primary model first, then fallback
+        fallback_models = ['minimax', 'ollama']
+        return self.call_model(self.default_model, prompt, 
+                           data={"repository": repository_data, "pull_requests": pr_data},
+                           fallback_models=fallback_models)
+    
+    def _build_pain_point_prompt(self, repository_data: Dict, pr_data: List[Dict] = None) -> str:
+        """Build prompt for pain point analysis from precompiled templates"""
+        sections = [_PAIN_POINT_HEADER_TMPL.substitute(
+            name=repository_data.get('name', 'Unknown'),
+            owner=repository_data.get('owner', 'Unknown'),
+            language=repository_data.get('language', 'Unknown'),
+            description=trim_to_token_budget(repository_data.get('description'), PROMPT_FIELD_BUDGET) or 'None',
+            health_score=repository_data.get('health_score', 'Unknown'),
+            open_pr_count=len(pr_data or []),
+        )]
+
+        if pr_data:
+            for i, pr in enumerate(pr_data[:5], 1):  # Limit to first 5 PRs
+                sections.append(_PAIN_POINT_PR_TMPL.substitute(
+                    index=i,
+                    title=trim_to_token_budget(pr.get('title', 'No title'), PR_FIELD_BUDGET),
+                    description=trim_to_token_budget(pr.get('description'), PR_FIELD_BUDGET) or 'None',
+                    author=pr.get('author', 'Unknown'),
+                    state=pr.get('state', 'Unknown'),
+                    additions=pr.get('additions', 0),
+                    deletions=pr.get('deletions', 0),
+                    review_comments=pr.get('review_comments', 0),
+                    mergeable=pr.get('mergeable', 'Unknown'),
+                ))
+
+        sections.append(_PAIN_POINT_INSTRUCTIONS)
+        return ''.join(sections)
+    
+    def analyze_pain_points_batch(self, repositories: List[Dict[str, Any]]) -> List[ModelResponse]:
+        """Analyze several repositories in one model call.
+
+        Packs every repository summary into a single prompt so the run pays
+        one network round-trip instead of N. Falls back to per-repo calls
+        when the batched response cannot be parsed into one entry per repo.
+        """
+        if not repositories:
+            return []
+        if len(repositories) == 1:
+            entry = repositories[0]
+            return [self.analyze_pain_points(entry.get('repository', {}), entry.get('pull_requests'))]
+
+        prompt = self._build_batch_pain_point_prompt(repositories)
+        fallback_models = ['minimax', 'ollama']
+        try:
+            response = self.call_model(self.default_model, prompt, fallback_models=fallback_models)
+            parsed = self._parse_batch_pain_points(response, len(repositories))
+            if parsed is not None:
+                return parsed
+            logger.warning("Batched pain-point response unparseable; falling back to per-repo calls")
+        except Exception as e:
+            logger.warning(f"Batched pain-point call failed ({e}); falling back to per-repo calls")
+
+        return [
+            self.analyze_pain_points(entry.get('repository', {}), entry.get('pull_requests'))
+            for entry in repositories
+        ]
+
+    def _build_batch_pain_point_prompt(self, repositories: List[Dict[str, Any]]) -> str:
+        """Build one prompt covering every repository in the batch"""
+        sections = ["\n        Analyze the following repositories for potential pain points and issues:\n"]
+        for i, entry in enumerate(repositories, 1):
+            repo = entry.get('repository', {})
+            pr_data = entry.get('pull_requests') or []
+            sections.append(_BATCH_REPO_HEADER_TMPL.substitute(
+                index=i,
+                owner=repo.get('owner', 'Unknown'),
+                name=repo.get('name', 'Unknown'),
+                language=repo.get('language', 'Unknown'),
+                description=trim_to_token_budget(repo.get('description'), PROMPT_FIELD_BUDGET) or 'None',
+                health_score=repo.get('health_score', 'Unknown'),
+                open_pr_count=len(pr_data),
+            ))
+        sections.append(_BATCH_INSTRUCTIONS)
+        return ''.join(sections)
+
+    def _parse_batch_pain_points(self, response: ModelResponse, expected: int) -> Optional[List[ModelResponse]]:
+        """Split a batched response into one ModelResponse per repository"""
+        content = (response.content or '').strip()
+        if content.startswith('```'):
+            content = content.strip('`')
+            if content.startswith('json'):
+                content = content[4:]
+        try:
+            payload = json.loads(content)
+        except (ValueError, TypeError):
+            return None
+
+        entries = payload.get('repositories') if isinstance(payload, dict) else None
+        if not isinstance(entries, list) or len(entries) != expected:
+            return None
+
+        per_repo = []
+        for entry in entries:
+            if not isinstance(entry, dict):
+                return None
+            per_repo.append(ModelResponse(
+                content=json.dumps(entry),
+                model=response.model,
+                confidence=float(entry.get('confidence', response.confidence) or 0.0),
+                tokens_used=response.tokens_used // expected,
+                metadata={
+                    'pain_points': entry.get('pain_points', []),
+                    'summary': entry.get('summary', ''),
+                    'repository': entry.get('repository'),
+                    'batched': True,
+                },
+            ))
+        return per_repo
+
+    def generate_recommendations(self, pain_point: Dict) -> ModelResponse:
+        """Generate recommendations for a specific pain point"""
+        prompt = self._build_recommendation_prompt(pain_point)
+        
+        # Use lighter model for recommendations
+        return self.call_model('minimax', prompt, 
+                           fallback_models=['glm_4_6', 'ollama'])
+    
+    def _build_recommendation_prompt(self, pain_point: Dict) -> str:
+        """Build prompt for recommendation generation"""
+        return _RECOMMENDATION_TMPL.substitute(
+            type=pain_point.get('type', 'Unknown'),
+            severity=pain_point.get('severity', 'Unknown'),
+            description=pain_point.get('description', 'No description'),
+            confidence=pain_point.get('confidence', 'Unknown'),
+        )
+    
+    def get_model_stats(self) -> Dict[str, Any]:
+        """Get usage statistics for all models"""
+        return {
+            "available_models": self.get_available_models(),
+            "default_model": self.default_model,
+            "model_configs": {name: {
+                "model": cfg.model,
+                "temperature": cfg.temperature,
+                "max_tokens": cfg.max_tokens,
+                "timeout": cfg.timeout
+            } for name, cfg in self.models.items()
+            }
         }
\ No newline at end of file
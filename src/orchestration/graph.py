@@ -4,10 +4,26 @@ Enhanced graph-based orchestration for repository analysis with LangGraph integr
 """
 
 import os
-import logging
+import json
+import time
+import hashlib
+import asyncio
+import threading
+import itertools
+import functools
+import concurrent.futures
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Dict, List, Any, Optional, TypedDict
-from urllib.parse import quote_plus
+from pathlib import Path
+from typing import Annotated, Dict, List, Any, Optional, TypedDict
+from urllib.parse import quote, quote_plus
+
+# orjson is noticeably faster for cache-key serialization; fall back to the
+# stdlib when it is not installed
+try:
+    import orjson
+except Exception:
+    orjson = None
 
 from langgraph.graph import StateGraph, START, END
 from langgraph.checkpoint.memory import MemorySaver
@@ -18,10 +34,24 @@ try:
 except Exception:
     PostgresSaver = None
 
+# Optional psycopg connection pool for the Postgres checkpointer; without it
+# each orchestrator opens a fresh connection per construction
+try:
+    from psycopg_pool import ConnectionPool
+except Exception:
+    ConnectionPool = None
+
+# Optional SQLite checkpointer; durable and cheaper per write than MemorySaver's
+# in-process deep copies, without requiring a Postgres instance
+try:
+    from langgraph.checkpoint.sqlite import SqliteSaver
+except Exception:
+    SqliteSaver = None
+
 from src.storage.adapter import StorageAdapter
 from src.repo_manager import RepoManager, SyncResult
 from src.agents.data_collection import DataCollectionAgent
-from src.models.model_manager import ModelManager
+from src.models.model_manager import ModelManager, ModelResponse
 from src.agents.visualization import VisualizationAgent
 from src.agents.output import OutputAgent
 from src.agents.complexity_agent import ComplexityAgent
@@ -32,8 +62,160 @@ from src.utils.logging import get_logger, correlation_context
 # Replace standard logging with enhanced structured logging
 logger = get_logger(__name__)
 
+# Severity labels the models emit, mapped to numeric weights for aggregation
+_SEVERITY_WEIGHTS = {'critical': 1.0, 'high': 0.75, 'medium': 0.5, 'low': 0.25}
+
+
+def _score_pain_points(pain_points: List[Dict[str, Any]], confidence: float) -> float:
+    """Aggregate pain points into a single severity score in [0, 1].
+
+    Kept as a pure numeric function, separate from the LLM-calling code, so
+    it can be profiled or compiled independently if pain-point lists grow.
+    """
+    if not pain_points:
+        return 0.0
+    total = 0.0
+    for point in pain_points:
+        severity = point.get('severity')
+        if isinstance(severity, (int, float)):
+            # The prompts ask for "Severity level (1-5)"; normalize onto [0, 1]
+            weight = min(max(float(severity), 0.0), 5.0) / 5.0
+        else:
+            weight = _SEVERITY_WEIGHTS.get(str(severity).lower(), 0.5)
+        total += weight
+    return min(total / len(pain_points) * confidence, 1.0)
+
+
+def _timed(step_name: str):
+    """Decorator: log a step_complete record with duration_ms for a node.
+
+    perf_counter is monotonic and far cheaper than datetime.now(); the
+    structured duration field is what p50/p95 rollups aggregate on.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(self, state):
+            start = time.perf_counter()
+            try:
+                return await fn(self, state)
+            finally:
+                logger.info(
+                    "step_complete",
+                    extra=self._extra(step_name, duration_ms=(time.perf_counter() - start) * 1000),
+                )
+        return wrapper
+    return decorator
+
+
+def _merge_dicts(left: Optional[Dict], right: Optional[Dict]) -> Dict:
+    """Reducer: shallow-merge concurrent dict updates from parallel branches."""
+    return {**(left or {}), **(right or {})}
+
+
+# Upper bound on accumulated errors; past this the oldest are dropped so a
+# pathological run cannot grow every checkpoint write
+_MAX_ERRORS = 100
+
+
+def _bounded_errors(left: Optional[List[str]], right: Optional[List[str]]) -> List[str]:
+    """Reducer: append unique errors, keeping only the most recent _MAX_ERRORS."""
+    merged = list(left or [])
+    seen = set(merged)
+    for err in (right or []):
+        if err not in seen:
+            merged.append(err)
+            seen.add(err)
+    if len(merged) > _MAX_ERRORS:
+        del merged[:-_MAX_ERRORS]
+    return merged
+
+
+def _merge_repo_results(left: Optional[Dict], right: Optional[Dict]) -> Dict:
+    """Reducer: field-wise merge of RepoResult updates from parallel branches.
+
+    The complexity, security and pain-point analyzers each fill different
+    RepoResult fields concurrently; a plain dict merge would keep only one
+    branch's copy per repo and drop the others' work.
+    """
+    merged = dict(left or {})
+    for key, incoming in (right or {}).items():
+        existing = merged.get(key)
+        if isinstance(existing, RepoResult) and isinstance(incoming, RepoResult):
+            merged[key] = RepoResult(
+                repository_data=incoming.repository_data or existing.repository_data,
+                owner=incoming.owner or existing.owner,
+                name=incoming.name or existing.name,
+                path_valid=incoming.path_valid or existing.path_valid,
+                summary=(
+                    incoming.summary
+                    if incoming.summary is not None
+                    else existing.summary
+                ),
+                analysis_results=(
+                    incoming.analysis_results
+                    if incoming.analysis_results is not None
+                    else existing.analysis_results
+                ),
+                visualizations=(
+                    incoming.visualizations
+                    if incoming.visualizations is not None
+                    else existing.visualizations
+                ),
+            )
+        else:
+            merged[key] = incoming
+    return merged
+
+
+# Precomputed agent-log template: one .format call per repo instead of
+# assembling and joining a list of f-string fragments
+_ANALYSIS_LOG_TMPL = (
+    "Agent: structure_architecture\n"
+    "Repository: {repo}\n"
+    "Timestamp: {ts}\n"
+    "\n"
+    "Model: {model} (confidence {confidence:.2f})\n"
+    "\n"
+    "Identified Pain Points:\n"
+    "{pain_point_block}"
+)
+
+
+def _last_value(left: Any, right: Any) -> Any:
+    """Reducer: keep the most recent value when parallel branches both write."""
+    return right if right is not None else left
+
+
+@dataclass(slots=True)
+class RepoResult:
+    """Per-repository pipeline results carried through GraphState.
+
+    Slotted attribute access is cheaper than the previous dict-of-dicts and
+    keeps the per-repo footprint small as the repo count grows.
+
+    repository_data and visualizations hold blob-store references (see
+    RepositoryAnalysisGraph._repo_data / _viz_results), not the payloads
+    themselves, so checkpointing the state copies short strings instead of
+    nested PR bodies, file lists and mermaid code.
+    """
+
+    repository_data: Any
+    owner: str = ""
+    name: str = ""
+    path_valid: bool = False
+    # Small projection ({name, owner, health_score, open_prs, ci_status})
+    # built once at collect time and reused by the analysis and report nodes
+    summary: Optional[Dict[str, Any]] = None
+    analysis_results: Optional[Dict[str, Any]] = None
+    visualizations: Any = None
+
+
 class GraphState(TypedDict, total=False):
-    """Global state passed between LangGraph nodes."""
+    """Global state passed between LangGraph nodes.
+
+    Keys written by concurrently scheduled nodes carry reducers so parallel
+    branches can merge their updates; nodes must return deltas only.
+    """
 
     # Input configuration
     repos: List[str]
@@ -42,55 +224,288 @@ class GraphState(TypedDict, total=False):
 
     # Processing state
     changed_repos: List[str]
-    baselines: Dict[str, Any]
-    per_repo_results: Dict[str, Dict[str, Any]]
+    head_shas: Dict[str, str]
+    per_repo_results: Annotated[Dict[str, "RepoResult"], _merge_repo_results]
 
     # Code quality analysis state
-    complexity_results: Dict[str, Any]
-    security_results: Dict[str, Any]
+    complexity_results: Annotated[Dict[str, Any], _merge_dicts]
+    security_results: Annotated[Dict[str, Any], _merge_dicts]
 
     # Output state
-    visualizations: List[Dict[str, Any]]
     summary: Dict[str, Any]
-    metrics: Dict[str, Any]
+    metrics: Annotated[Dict[str, Any], _merge_dicts]
 
     # Error handling and orchestration metadata
-    errors: List[str]
-    current_step: str
+    errors: Annotated[List[str], _bounded_errors]
+    current_step: Annotated[str, _last_value]
 
 class RepositoryAnalysisGraph:
     """LangGraph-based repository analysis orchestrator"""
-    
+
+    # Compiled workflow cache shared across orchestrator instances. compile()
+    # re-runs topology validation on every call, which adds up when worker
+    # pools or test suites create many equivalently configured orchestrators.
+    # A cached graph keeps the node bindings (and therefore the storage
+    # adapter) of the instance that compiled it, so entries are keyed on both
+    # the configuration and the storage identity.
+    _graph_cache: Dict[Any, Any] = {}
+
+    # Process-wide psycopg pools for the Postgres checkpointer, keyed by DSN;
+    # orchestrators sharing a database share connections and run the saver's
+    # DDL setup only once per process
+    _pg_pools: Dict[str, Any] = {}
+
     def __init__(self, config: Dict, storage: StorageAdapter):
         self.config = config
         self.storage = storage
 
-        # Initialize components
-        self.model_manager = ModelManager(config)
-        self.data_agent = DataCollectionAgent(config, storage, self.model_manager)
-        self.viz_agent = VisualizationAgent(config, storage, self.model_manager)
-        self.output_agent = OutputAgent(config, storage, self.model_manager)
-        self.complexity_agent = ComplexityAgent(storage=storage)
-        self.security_agent = SecurityAgent(storage=storage)
-        self.pr_agent = PRReviewAgent(config, storage, self.model_manager, self.output_agent)
-
         # Graph configuration
         self.graph_config = config.get('orchestration', {}).get('langgraph', {})
         self.max_concurrent_runs = self.graph_config.get('max_concurrent_runs', 5)
         self.timeout_seconds = self.graph_config.get('timeout_seconds', 3600)
         self.retry_attempts = self.graph_config.get('retry_attempts', 3)
 
+        # Pain-point analyses keyed by a hash of their inputs; repos whose
+        # health inputs are unchanged skip the LLM call entirely
+        self._pain_point_cache: Dict[str, Any] = {}
+
+        # Strong references to fire-and-forget tasks (report cleanup etc.)
+        # so the event loop cannot garbage-collect them mid-flight
+        self._bg_tasks: set = set()
+
+        # Short-TTL cache for stats/health probes so monitoring scrapes do
+        # not hammer the model endpoints and database every few seconds
+        self._stats_cache: Dict[str, Any] = {}
+        self._stats_cache_ttl = float(self.graph_config.get('stats_cache_ttl', 5.0))
+
+        # Large immutable RepositoryData objects live here, keyed by
+        # run/repo; GraphState carries only the keys so checkpoint copies
+        # stay small
+        self._blob_store: Dict[str, Any] = {}
+
         # Initialize LangGraph
         self.graph = self._build_langgraph()
 
-        # Initialize repo manager
-        self.repo_manager = RepoManager(self.config)
-    
+    # Agents are constructed on first use. Callers that only touch
+    # get_graph_stats (or runs with PR review disabled) never pay for the
+    # model clients and filesystem setup the full agent set drags in.
+
+    @functools.cached_property
+    def model_manager(self) -> ModelManager:
+        return ModelManager(self.config)
+
+    @functools.cached_property
+    def data_agent(self) -> DataCollectionAgent:
+        return DataCollectionAgent(self.config, self.storage, self.model_manager)
+
+    @functools.cached_property
+    def viz_agent(self) -> VisualizationAgent:
+        return VisualizationAgent(self.config, self.storage, self.model_manager)
+
+    @functools.cached_property
+    def output_agent(self) -> OutputAgent:
+        return OutputAgent(self.config, self.storage, self.model_manager)
+
+    @functools.cached_property
+    def complexity_agent(self) -> ComplexityAgent:
+        return ComplexityAgent(storage=self.storage)
+
+    @functools.cached_property
+    def security_agent(self) -> SecurityAgent:
+        return SecurityAgent(storage=self.storage)
+
+    @functools.cached_property
+    def pr_agent(self) -> PRReviewAgent:
+        return PRReviewAgent(self.config, self.storage, self.model_manager, self.output_agent)
+
+    @functools.cached_property
+    def repo_manager(self) -> RepoManager:
+        return RepoManager(self.config)
+
+    # Fixed portion of every structured log extra; copied rather than rebuilt
+    # as a dict literal in each node
+    _EXTRA_BASE = {'component': 'RepositoryAnalysisGraph'}
+
+    @classmethod
+    def _extra(cls, step: str, **fields: Any) -> Dict[str, Any]:
+        """Structured-log extra with the fixed component key pre-filled"""
+        extra = dict(cls._EXTRA_BASE)
+        extra['step'] = step
+        extra.update(fields)
+        return extra
+
+    def _repo_data(self, repo_result: "RepoResult") -> Any:
+        """Resolve a RepoResult's repository_data blob reference.
+
+        Heavy RepositoryData lives process-locally, so a resumed checkpoint
+        from another process loses it; that is an accepted trade-off because
+        the data is re-derivable from the mirror path by re-running
+        collect_data.
+        """
+        ref = repo_result.repository_data
+        if isinstance(ref, str):
+            repo_data = self._blob_store.get(ref)
+            if repo_data is None:
+                logger.debug("No blob for %s; state likely resumed from another process", ref)
+            return repo_data
+        return ref
+
+    def _viz_results(self, repo_result: "RepoResult") -> Optional[List[Any]]:
+        """Resolve a RepoResult's visualizations blob reference.
+
+        Mermaid code is by far the largest per-repo payload after the raw
+        repository data; like _repo_data it stays process-local and is
+        re-derivable by re-running generate_visualizations.
+        """
+        ref = repo_result.visualizations
+        if isinstance(ref, str):
+            viz_results = self._blob_store.get(ref)
+            if viz_results is None:
+                logger.debug("No blob for %s; state likely resumed from another process", ref)
+            return viz_results
+        return ref
+
+    @staticmethod
+    def _pain_point_cache_key(repo_key: str, repo_data: Any) -> str:
+        """Content hash of the inputs that feed the pain-point prompt"""
+        payload = {
+            'repo': repo_key,
+            'health_score': repo_data.health_score,
+            'open_prs': len(repo_data.open_prs or []),
+            'ci_status': repo_data.ci_status,
+        }
+        if orjson is not None:
+            raw = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        else:
+            raw = json.dumps(payload, sort_keys=True, default=str).encode()
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+    @property
+    def _analysis_cache_ttl(self) -> int:
+        return int(
+            self.config.get('agents', {})
+            .get('pain_point_analyzer', {})
+            .get('cache_ttl_seconds', 86400)
+        )
+
+    async def _load_cached_analysis(self, cache_key: str) -> Optional[ModelResponse]:
+        """Fetch a pain-point analysis from the persistent cross-run cache"""
+        if not hasattr(self.storage, 'get_llm_cache'):
+            return None
+        try:
+            payload = await self._run_blocking(
+                self.storage.get_llm_cache, cache_key, self._analysis_cache_ttl
+            )
+        except Exception as e:
+            logger.debug("Persistent analysis cache read failed: %s", e)
+            return None
+        if not payload:
+            return None
+        response = ModelResponse(
+            content=payload.get('content', ''),
+            model=payload.get('model', 'cached'),
+            confidence=payload.get('confidence', 0.8),
+            tokens_used=payload.get('tokens_used', 0),
+            metadata=payload.get('metadata'),
+        )
+        self._pain_point_cache[cache_key] = response
+        return response
+
+    async def _store_cached_analysis(self, cache_key: str, response: ModelResponse) -> None:
+        """Persist a pain-point analysis so later runs can skip the model call"""
+        if not hasattr(self.storage, 'put_llm_cache'):
+            return
+        payload = {
+            'content': response.content,
+            'model': response.model,
+            'confidence': response.confidence,
+            'tokens_used': response.tokens_used,
+            'metadata': response.metadata,
+        }
+        try:
+            await self._run_blocking(self.storage.put_llm_cache, cache_key, payload)
+        except Exception as e:
+            logger.debug("Persistent analysis cache write failed: %s", e)
+
+    @functools.cached_property
+    def _executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """Dedicated pool for blocking LLM/storage/git calls.
+
+        Keeps them off the event loop (and off the interpreter-wide default
+        executor shared with unrelated to_thread users). Created lazily: on a
+        graph-cache hit the compiled nodes belong to the instance that built
+        them, so a reusing instance never runs node code and should not pay
+        for an idle pool of threads.
+        """
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_concurrent_runs * 4,
+            thread_name_prefix='graph-io',
+        )
+        # Pre-spawn the pool's threads in the background so the first
+        # fan-out overlaps immediately instead of paying thread creation
+        # one submission at a time
+        threading.Thread(target=self._warm_executor, args=(executor,), daemon=True).start()
+        return executor
+
+    async def _run_blocking(self, fn, *args, **kwargs):
+        """Run a synchronous callable on the orchestrator's I/O pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    @staticmethod
+    def _warm_executor(executor: concurrent.futures.ThreadPoolExecutor) -> None:
+        """Force every executor thread into existence with a barrier.
+
+        ThreadPoolExecutor spawns threads lazily per submission, so without
+        this the first parallel node pays thread creation serially. Runs on
+        a daemon thread; a failure here only forfeits the warm-up.
+        """
+        try:
+            workers = executor._max_workers
+            barrier = threading.Barrier(workers + 1)
+            for _ in range(workers):
+                # Pool-side waits carry the timeout too: if the executor is
+                # shut down mid-warm-up the barrier never fills, and an
+                # unbounded wait would pin its thread forever
+                executor.submit(barrier.wait, 10)
+            barrier.wait(timeout=10)
+        except Exception as exc:
+            logger.debug("Executor warm-up skipped: %s", exc)
+
+    def aclose(self) -> None:
+        """Release the blocking-call executor once the orchestrator is done"""
+        executor = self.__dict__.get('_executor')
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def _build_langgraph(self) -> Optional[StateGraph]:
-        """Build the LangGraph workflow"""
+        """Return the compiled workflow, reusing a cached compile when possible"""
         if not StateGraph:
             return None
-        
+
+        try:
+            # The compiled nodes are bound methods of this instance, which
+            # writes through self.storage — so two instances may only share
+            # a compile when they share both config and storage adapter
+            cfg_key = (json.dumps(self.config, sort_keys=True, default=str), id(self.storage))
+        except Exception:
+            cfg_key = None
+
+        if cfg_key is not None:
+            cached = self._graph_cache.get(cfg_key)
+            if cached is not None:
+                logger.debug("Reusing cached compiled graph")
+                compiled, checkpointer = cached
+                self._checkpointer = checkpointer
+                return compiled
+
+        compiled = self._compile_fresh()
+        if cfg_key is not None:
+            self._graph_cache[cfg_key] = (compiled, self._checkpointer)
+        return compiled
+
+    def _compile_fresh(self):
+        """Build and compile the LangGraph workflow"""
         # Create the graph
         workflow = StateGraph(GraphState)
         
@@ -102,6 +517,7 @@ class RepositoryAnalysisGraph:
         workflow.add_node("analyze_complexity", self._analyze_complexity)
         workflow.add_node("analyze_security", self._analyze_security)
         workflow.add_node("analyze_repositories", self._analyze_repositories)
+        workflow.add_node("join_analyses", self._join_analyses)
         workflow.add_node("generate_visualizations", self._generate_visualizations)
         workflow.add_node("review_pull_requests", self._review_pull_requests)
         workflow.add_node("generate_report", self._generate_report)
@@ -111,46 +527,79 @@ class RepositoryAnalysisGraph:
         workflow.add_edge(START, "initialize")
         workflow.add_edge("initialize", "sync_repositories")
         workflow.add_edge("sync_repositories", "detect_changes")
-        workflow.add_edge("detect_changes", "collect_data")
+        # Nothing changed means nothing to collect or analyze; route straight
+        # to finalize so incremental no-op runs cost two nodes, not eleven
+        workflow.add_conditional_edges(
+            "detect_changes",
+            self._change_routing_condition,
+        )
+        # Complexity, security and pain-point analysis only read collected
+        # repo data; run them as sibling branches and fan in at join_analyses
         workflow.add_edge("collect_data", "analyze_complexity")
-        workflow.add_edge("analyze_complexity", "analyze_security")
-        workflow.add_edge("analyze_security", "analyze_repositories")
-        workflow.add_edge("generate_visualizations", "review_pull_requests")
-        workflow.add_edge("generate_visualizations", "generate_report")
-        workflow.add_edge("review_pull_requests", "generate_report")
+        workflow.add_edge("collect_data", "analyze_security")
+        workflow.add_edge("collect_data", "analyze_repositories")
+        # List-form joins: the successor fires exactly once, after every
+        # named branch has completed, rather than once per incoming edge
+        workflow.add_edge(
+            ["analyze_complexity", "analyze_security", "analyze_repositories"],
+            "join_analyses",
+        )
+        # Visualizations and PR reviews are independent given analysis output;
+        # both fan in at generate_report
+        workflow.add_edge(
+            ["generate_visualizations", "review_pull_requests"], "generate_report"
+        )
         workflow.add_edge("generate_report", "finalize")
         workflow.add_edge("finalize", END)
-        
-        # Add conditional edges for error handling
+
+        # Fan out to parallel branches on success, short-circuit on error
         workflow.add_conditional_edges(
-            "analyze_repositories",
+            "join_analyses",
             self._analysis_routing_condition,
-            {
-                "success": "generate_visualizations",
-                "error": "finalize"
-            }
         )
         
-        checkpointer = self._build_checkpointer()
+        # Keep a handle on the raw checkpointer so hot paths can read
+        # checkpoints with get_tuple instead of the heavier graph.get_state
+        self._checkpointer = self._build_checkpointer()
+
+        return workflow.compile(checkpointer=self._checkpointer)
 
-        return workflow.compile(checkpointer=checkpointer)
+    async def _join_analyses(self, state: GraphState) -> GraphState:
+        """Fan-in barrier for the three analyzer branches; reducers do the merge"""
+        return {"current_step": "join_analyses"}
 
     @staticmethod
-    def _analysis_routing_condition(state: GraphState) -> str:
-        """Route to finalize if any errors were recorded during repo analysis."""
+    def _change_routing_condition(state: GraphState):
+        """Skip the analysis pipeline entirely when no repository changed."""
+        if not state.get("changed_repos"):
+            logger.info("No changed repositories; skipping straight to finalize")
+            return "finalize"
+        return "collect_data"
+
+    @staticmethod
+    def _analysis_routing_condition(state: GraphState):
+        """Route to finalize on errors, otherwise fan out to parallel branches."""
         errors = state.get("errors") or []
-        return "error" if errors else "success"
+        if errors:
+            return "finalize"
+        per_repo_results = state.get("per_repo_results", {})
+        if not any(r.analysis_results for r in per_repo_results.values()):
+            # Nothing analyzable survived; skip straight to finalize rather
+            # than walking the repo set through viz/report for nothing
+            logger.warning("No repository produced analysis results; skipping visualization and report")
+            return "finalize"
+        return ["generate_visualizations", "review_pull_requests"]
 
     def _build_checkpointer(self):
-        """Select the configured LangGraph checkpointer."""
+        """Select the configured LangGraph checkpointer (memory, sqlite or postgres)."""
         checkpointer_name = self.graph_config.get('checkpointer', 'memory')
         checkpointer_name = (checkpointer_name or 'memory').lower()
 
         if checkpointer_name == 'postgres' and PostgresSaver is not None:
-            conn_string = self._postgres_connection_url()
+            conn_string = self._postgres_connection_url
             if conn_string:
                 try:
-                    return PostgresSaver.from_conn_string(conn_string)
+                    return self._postgres_checkpointer(conn_string)
                 except Exception as exc:
                     logger.warning(
                         "Postgres checkpointer unavailable (%s); falling back to MemorySaver",
@@ -159,10 +608,71 @@ class RepositoryAnalysisGraph:
             else:
                 logger.warning("Postgres checkpointer requested but database config missing; using MemorySaver")
 
+        if checkpointer_name == 'sqlite':
+            if SqliteSaver is not None:
+                checkpoint_dir = Path(self.graph_config.get('checkpoint_dir', 'state'))
+                checkpoint_dir.mkdir(parents=True, exist_ok=True)
+                try:
+                    import sqlite3
+                    conn = sqlite3.connect(
+                        str(checkpoint_dir / 'langgraph_checkpoints.sqlite'),
+                        check_same_thread=False,
+                    )
+                    return SqliteSaver(conn)
+                except Exception as exc:
+                    logger.warning(
+                        "SQLite checkpointer unavailable (%s); falling back to MemorySaver",
+                        exc,
+                    )
+            else:
+                logger.warning("SQLite checkpointer requested but langgraph-checkpoint-sqlite not installed; using MemorySaver")
+
         return MemorySaver()
 
+    def _postgres_checkpointer(self, conn_string: str):
+        """Build a PostgresSaver on a shared connection pool.
+
+        from_conn_string opens a fresh connection and the saver's setup()
+        issues DDL per construction; pooling amortizes the TCP/TLS/auth
+        round trips across runs and restricts setup() to first use.
+        """
+        if ConnectionPool is None:
+            logger.warning("psycopg_pool not installed; Postgres checkpointer runs unpooled")
+            return PostgresSaver.from_conn_string(conn_string)
+
+        pool = self._pg_pools.get(conn_string)
+        if pool is not None:
+            return PostgresSaver(pool)
+
+        pool = ConnectionPool(
+            conn_string,
+            min_size=1,
+            max_size=max(self.max_concurrent_runs, 1),
+            kwargs={"autocommit": True, "prepare_threshold": 0},
+        )
+        saver = PostgresSaver(pool)
+        saver.setup()
+        self._pg_pools[conn_string] = pool
+        return saver
+
+    @classmethod
+    def close_checkpointer_pools(cls) -> None:
+        """Close the shared Postgres checkpointer pools (process shutdown)."""
+        for conn_string, pool in list(cls._pg_pools.items()):
+            try:
+                pool.close()
+            except Exception as exc:
+                logger.warning("Failed to close checkpointer pool for %s: %s", conn_string, exc)
+            cls._pg_pools.pop(conn_string, None)
+
+    @functools.cached_property
     def _postgres_connection_url(self) -> Optional[str]:
-        """Build a psycopg-compatible connection string from config."""
+        """Build a psycopg-compatible connection string from config.
+
+        Cached per instance: config and environment are fixed for the
+        orchestrator's lifetime, so the getenv/quoting work runs once and
+        the assembled secret is not re-derived on every checkpointer build.
+        """
         db_cfg = self.config.get('database', {}) or {}
         host = db_cfg.get('host') or os.getenv('POSTGRES_HOST')
         name = db_cfg.get('name') or os.getenv('POSTGRES_DB')
@@ -177,7 +687,58 @@ class RepositoryAnalysisGraph:
         if password:
             auth = f"{auth}:{quote_plus(str(password))}"
 
-        return f"postgresql://{auth}@{host}:{port}/{name}"
+        url = f"postgresql://{auth}@{host}:{port}/{name}"
+        if db_cfg.get('wal_tuning'):
+            # Session-level relaxation for the checkpointer connections only:
+            # a lost checkpoint is recoverable by re-running the graph, so
+            # skipping the per-commit WAL flush is safe and removes the fsync
+            # stall from every state snapshot. Server-side knobs are the
+            # operator's call; see docs/operations/Checkpointer-and-Persistence.md.
+            url += "?options=" + quote("-c synchronous_commit=off")
+        return url
+
+    def _checkpoint_durability(self) -> Optional[str]:
+        """Return the configured checkpoint durability mode, if valid.
+
+        LangGraph serializes state at every superstep by default; 'async'
+        moves those writes off the hot path and 'exit' only checkpoints
+        when the run finishes — the coarse-checkpointing option for large
+        per_repo_results states.
+        """
+        durability = self.graph_config.get('checkpoint_durability')
+        if durability is None:
+            return None
+        if durability not in ('sync', 'async', 'exit'):
+            logger.warning(
+                "Ignoring invalid checkpoint_durability %r (expected sync/async/exit)",
+                durability,
+            )
+            return None
+        return durability
+
+    async def _mark_run_timed_out(self, config: Dict[str, Any]) -> None:
+        """Record a timeout on the analysis run row, if one was created.
+
+        The run id only lives in graph state, so recover it from the last
+        checkpoint; a run that timed out before initialize has no row to
+        update and is skipped silently.
+        """
+        try:
+            checkpoint_tuple = self._fast_get_state(config)
+            if checkpoint_tuple is None:
+                return
+            channel_values = checkpoint_tuple.checkpoint.get('channel_values', {})
+            run_id = channel_values.get('metrics', {}).get('analysis_run_id')
+            if run_id is None:
+                return
+            await self._run_blocking(
+                self.storage.update_analysis_run_status,
+                run_id,
+                'failed',
+                error_message=f"Timed out after {self.timeout_seconds} seconds",
+            )
+        except Exception as e:
+            logger.warning("Could not mark timed-out run as failed: %s", e)
 
     def _build_run_config(
         self,
@@ -197,6 +758,8 @@ class RepositoryAnalysisGraph:
 
         configurable = {
             "run_type": run_type,
+            # thread_id keys checkpointer records; persistent savers need it
+            "thread_id": run_id,
         }
         if user_id is not None:
             configurable["user_id"] = user_id
@@ -212,11 +775,42 @@ class RepositoryAnalysisGraph:
             config["tags"] = tags
 
         return config
-    
-    async def run_analysis(self, repos: List[str], user_id: int = None, 
-                        run_type: str = 'full') -> Dict[str, Any]:
-        """Run the complete analysis workflow"""
-        logger.info(f"Starting analysis for {len(repos)} repositories")
+
+    async def _stream_analysis(self, initial_state: GraphState, config: Dict[str, Any],
+                               durability: Optional[str], on_event) -> Dict[str, Any]:
+        """Drive the graph with astream rather than ainvoke.
+
+        Streaming both modes keeps the final state in hand (values) while
+        surfacing per-node deltas to the caller as they complete (updates),
+        so report writers and UIs can overlap with later nodes.
+        """
+        final_state: Dict[str, Any] = dict(initial_state)
+        async for mode, chunk in self.graph.astream(
+            initial_state,
+            config=config,
+            durability=durability,
+            stream_mode=["updates", "values"],
+        ):
+            if mode == "values":
+                final_state = chunk
+            elif on_event is not None:
+                try:
+                    on_event(chunk)
+                except Exception as exc:
+                    # A broken consumer must not abort the analysis itself
+                    logger.warning("on_event callback failed: %s", exc)
+        return final_state
+
+    async def run_analysis(self, repos: List[str], user_id: int = None,
+                        run_type: str = 'full',
+                        on_event=None) -> Dict[str, Any]:
+        """Run the complete analysis workflow.
+
+        When on_event is provided it is called with each node's state delta
+        as the graph streams, so callers (CLI progress, websockets, partial
+        report writers) can consume results while later nodes still run.
+        """
+        logger.info("Starting analysis for %d repositories", len(repos))
         
         # Graph must be available; run
         
@@ -227,11 +821,9 @@ class RepositoryAnalysisGraph:
             "run_type": run_type,
             "current_step": "initialization",
             "changed_repos": [],
-            "baselines": {},
             "per_repo_results": {},
             "complexity_results": {},
             "security_results": {},
-            "visualizations": [],
             "summary": {},
             "metrics": {},
             "errors": [],
@@ -239,6 +831,7 @@ class RepositoryAnalysisGraph:
         
         try:
             recursion_limit = self.graph_config.get('recursion_limit', 25)
+            durability = self._checkpoint_durability()
             with correlation_context() as run_id:
                 config = self._build_run_config(
                     recursion_limit=recursion_limit,
@@ -247,7 +840,12 @@ class RepositoryAnalysisGraph:
                     run_type=run_type,
                 )
 
-                result = await self.graph.ainvoke(initial_state, config=config)
+                # Bound the whole invocation so stuck LLM or storage calls
+                # terminate at the configured timeout instead of leaking
+                result = await asyncio.wait_for(
+                    self._stream_analysis(initial_state, config, durability, on_event),
+                    timeout=self.timeout_seconds,
+                )
 
             logger.info("Analysis completed successfully")
             return {
@@ -256,23 +854,33 @@ class RepositoryAnalysisGraph:
                 "run_id": run_id,
                 "timestamp": datetime.now(timezone.utc).isoformat()
             }
-            
+
+        except asyncio.TimeoutError:
+            logger.error("Analysis timed out after %d seconds", self.timeout_seconds)
+            await self._mark_run_timed_out(config)
+            return {
+                "status": "failed",
+                "error": f"Analysis timed out after {self.timeout_seconds} seconds",
+                "timestamp": datetime.now(timezone.utc).isoformat()
+            }
         except Exception as e:
-            logger.error(f"Analysis failed: {e}")
+            logger.error("Analysis failed: %s", e)
             return {
                 "status": "failed",
                 "error": str(e),
                 "timestamp": datetime.now(timezone.utc).isoformat()
             }
 
+    @_timed('initialize')
     async def _initialize_analysis(self, state: GraphState) -> GraphState:
         """Initialize the analysis workflow"""
-        logger.info("Step: Initialize analysis")
+        logger.info("Step: Initialize analysis", extra=self._extra('initialize'))
         errors: List[str] = []
         metrics = dict(state.get("metrics", {}))
 
         try:
-            run = self.storage.create_analysis_run(
+            run = await self._run_blocking(
+                self.storage.create_analysis_run,
                 repo_id=None,
                 run_type=state.get("run_type", "full"),
                 created_by=state.get("user_id"),
@@ -289,65 +897,113 @@ class RepositoryAnalysisGraph:
             "metrics": metrics,
         }
 
+    @_timed('sync_repositories')
     async def _sync_repositories(self, state: GraphState) -> GraphState:
         """Ensure local mirrors are synced for configured repositories"""
-        logger.info("Step: Sync repositories")
-        errors = list(state.get("errors", []))
-        metrics = dict(state.get("metrics", {}))
+        logger.info("Step: Sync repositories", extra=self._extra('sync_repositories', repos_count=len(state.get("repos", []))))
+        errors: List[str] = []
+        metrics: Dict[str, Any] = {}
 
+        head_shas: Dict[str, str] = {}
         try:
-            sync_result: SyncResult = self.repo_manager.sync(state.get("repos", []))
+            sync_result: SyncResult = await self._run_blocking(
+                self.repo_manager.sync, state.get("repos", [])
+            )
+            head_shas = sync_result.head_shas or {}
             metrics['sync'] = {
                 'synced': sync_result.synced,
                 'cloned': sync_result.cloned,
                 'updated': sync_result.updated,
                 'failed': sync_result.failed,
-                'details_path': sync_result.details_path
+                'details_path': sync_result.details_path,
+                'repo_states': sync_result.repo_states or {},
             }
-            logger.info(f"Repositories synced: {sync_result.synced} (cloned {sync_result.cloned}, updated {sync_result.updated})")
+            logger.info(
+                "Repositories synced: %d (cloned %d, updated %d)",
+                sync_result.synced,
+                sync_result.cloned,
+                sync_result.updated,
+            )
         except Exception as e:
             errors.append(f"Repository sync failed: {e}")
-            logger.error(f"Repository sync failed: {e}")
-        
+            logger.error("Repository sync failed: %s", e)
+
         return {
             "current_step": "sync_repositories",
             "metrics": metrics,
+            "head_shas": head_shas,
             "errors": errors,
         }
     
+    @_timed('detect_changes')
     async def _detect_changes(self, state: GraphState) -> GraphState:
-        """Detect changes in repositories"""
-        logger.info("Step: Detect changes")
-        
+        """Detect changed repositories by diffing head SHAs against the last run"""
+        logger.info("Step: Detect changes", extra=self._extra('detect_changes'))
+
         repos = state.get("repos", [])
-        changed_repos = list(repos)
-        logger.info("Detected changes in %d repositories", len(changed_repos))
+        head_shas = state.get("head_shas", {}) or {}
+        repo_states = state.get("metrics", {}).get('sync', {}).get('repo_states', {})
+        # Repos whose sync failed have no trustworthy mirror to analyze;
+        # RepoManager already logged the per-repo failure
+        failed_syncs = {repo for repo, sync_state in repo_states.items() if sync_state == 'failed'}
+
+        if state.get("run_type", "full") == "full":
+            # Full runs always analyze everything
+            changed_repos = [repo for repo in repos if repo not in failed_syncs]
+        else:
+            last_shas = self.repo_manager.load_last_analyzed_shas()
+            changed_repos = [
+                repo for repo in repos
+                if repo not in failed_syncs
+                and (repo not in head_shas or head_shas[repo] != last_shas.get(repo))
+            ]
+
+        skipped = len(repos) - len(changed_repos)
+        logger.info("Detected changes in %d of %d repositories", len(changed_repos), len(repos))
 
         return {
             "current_step": "detect_changes",
             "changed_repos": changed_repos,
+            "metrics": {"changed_repo_count": len(changed_repos), "skipped_repo_count": skipped},
         }
     
+    @_timed('collect_data')
     async def _collect_repository_data(self, state: GraphState) -> GraphState:
         """Collect repository data"""
-        logger.info("Step: Collect repository data")
+        logger.info("Step: Collect repository data", extra=self._extra('collect_data'))
 
-        errors = list(state.get("errors", []))
-        per_repo_results: Dict[str, Dict[str, Any]] = {}
+        errors: List[str] = []
+        per_repo_results: Dict[str, RepoResult] = {}
 
         try:
-            repo_data_list = self.data_agent.collect_repository_data(
-                state.get("repos", []),
+            repo_data_list = await self._run_blocking(
+                self.data_agent.collect_repository_data,
+                state.get("changed_repos", []),
                 state.get("user_id"),
             )
 
+            analysis_run_id = state.get("metrics", {}).get('analysis_run_id')
             for repo_data in repo_data_list:
                 repo_key = f"{repo_data.owner}/{repo_data.name}"
-                per_repo_results[repo_key] = {
-                    'repository_data': repo_data,
-                    'analysis_results': None,
-                    'visualizations': None,
-                }
+                blob_id = f"{analysis_run_id}:{repo_key}"
+                self._blob_store[blob_id] = repo_data
+                per_repo_results[repo_key] = RepoResult(
+                    repository_data=blob_id,
+                    owner=repo_data.owner,
+                    name=repo_data.name,
+                    # Stat the mirror once here; analyzers read the flag
+                    # instead of re-issuing a syscall per repo per step
+                    path_valid=bool(repo_data.path) and os.path.isdir(repo_data.path),
+                    # Built once; the analysis and report nodes reuse this
+                    # instead of re-projecting the same attributes per repo
+                    summary={
+                        'name': repo_data.name,
+                        'owner': repo_data.owner,
+                        'health_score': repo_data.health_score,
+                        'open_prs': len(repo_data.open_prs or []),
+                        'ci_status': repo_data.ci_status,
+                    },
+                )
 
             logger.info("Collected data for %d repositories", len(repo_data_list))
 
@@ -360,214 +1016,281 @@ class RepositoryAnalysisGraph:
             "errors": errors,
         }
 
+    @_timed('analyze_complexity')
     async def _analyze_complexity(self, state: GraphState) -> GraphState:
         """Analyze code complexity for repositories"""
-        logger.info("Step: Analyze complexity")
+        logger.info("Step: Analyze complexity", extra=self._extra('analyze_complexity'))
 
-        errors = list(state.get("errors", []))
+        errors: List[str] = []
         metrics = state.get("metrics", {})
         analysis_run_id = metrics.get('analysis_run_id')
-        per_repo_results = {
-            key: value.copy() if isinstance(value, dict) else value
-            for key, value in state.get("per_repo_results", {}).items()
-        }
-        complexity_results = dict(state.get("complexity_results", {}))
-
-        try:
-            for repo_key, repo_result in per_repo_results.items():
-                repo_data = repo_result.get('repository_data')
-                repo_path = getattr(repo_data, 'path', None)
-
-                if repo_path and os.path.exists(repo_path):
-                    complexity_result = self.complexity_agent.analyze_repository(
-                        repo_path=repo_path,
-                        repo_name=repo_key,
-                        analysis_run_id=analysis_run_id,
-                    )
-                    serialized = complexity_result.to_dict()
-                    complexity_results[repo_key] = serialized
-                    repo_result['complexity_analysis'] = serialized
-                    logger.info(
-                        "Complexity analysis for %s: %s hotspots found",
-                        repo_key,
-                        complexity_result.metrics.get('total_hotspots', 0),
-                    )
-                else:
-                    logger.warning("Repository path not found for %s, skipping complexity analysis", repo_key)
+        per_repo_results = state.get("per_repo_results", {})
+        # complexity_results keyed by repo is the single canonical store;
+        # duplicating it onto RepoResult would double checkpoint volume
+        complexity_results: Dict[str, Any] = {}
+
+        semaphore = asyncio.Semaphore(self.max_concurrent_runs)
+
+        async def _analyze_one(repo_key: str, repo_result: RepoResult) -> None:
+            if not repo_result.path_valid:
+                logger.warning("Repository path not found for %s, skipping complexity analysis", repo_key)
+                return
+            repo_path = getattr(self._repo_data(repo_result), 'path', None)
+            async with semaphore:
+                complexity_result = await self._run_blocking(
+                    self.complexity_agent.analyze_repository,
+                    repo_path=repo_path,
+                    repo_name=repo_key,
+                    analysis_run_id=analysis_run_id,
+                )
+            serialized = complexity_result.to_dict()
+            complexity_results[repo_key] = serialized
+            logger.info(
+                "Complexity analysis for %s: %s hotspots found",
+                repo_key,
+                complexity_result.metrics.get('total_hotspots', 0),
+            )
 
-        except Exception as e:
-            logger.error("Complexity analysis failed: %s", e)
-            errors.append(f"Complexity analysis failed: {e}")
+        # Radon walks are filesystem/subprocess bound, so repos overlap freely
+        outcomes = await asyncio.gather(
+            *(_analyze_one(k, r) for k, r in per_repo_results.items()),
+            return_exceptions=True,
+        )
+        for repo_key, outcome in zip(per_repo_results, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error("Complexity analysis failed for %s: %s", repo_key, outcome)
+                errors.append(f"Complexity analysis failed for {repo_key}: {outcome}")
 
         return {
             "current_step": "analyze_complexity",
-            "per_repo_results": per_repo_results,
             "complexity_results": complexity_results,
             "errors": errors,
         }
 
+    @_timed('analyze_security')
     async def _analyze_security(self, state: GraphState) -> GraphState:
         """Scan repositories for security vulnerabilities"""
-        logger.info("Step: Analyze security")
+        logger.info("Step: Analyze security", extra=self._extra('analyze_security'))
 
-        errors = list(state.get("errors", []))
+        errors: List[str] = []
         metrics = state.get("metrics", {})
         analysis_run_id = metrics.get('analysis_run_id')
-        per_repo_results = {
-            key: value.copy() if isinstance(value, dict) else value
-            for key, value in state.get("per_repo_results", {}).items()
-        }
-        security_results = dict(state.get("security_results", {}))
-
-        try:
-            for repo_key, repo_result in per_repo_results.items():
-                repo_data = repo_result.get('repository_data')
-                repo_path = getattr(repo_data, 'path', None)
-
-                if repo_path and os.path.exists(repo_path):
-                    security_result = self.security_agent.analyze_repository(
-                        repo_path=repo_path,
-                        repo_name=repo_key,
-                        analysis_run_id=analysis_run_id,
-                    )
-                    serialized = security_result.to_dict()
-                    security_results[repo_key] = serialized
-                    repo_result['security_analysis'] = serialized
-                    logger.info(
-                        "Security scan for %s: %s vulnerabilities found (%s critical)",
-                        repo_key,
-                        security_result.summary.get('total_vulnerabilities', 0),
-                        security_result.summary.get('critical', 0),
-                    )
-                else:
-                    logger.warning("Repository path not found for %s, skipping security scan", repo_key)
+        per_repo_results = state.get("per_repo_results", {})
+        security_results: Dict[str, Any] = {}
+
+        semaphore = asyncio.Semaphore(self.max_concurrent_runs)
+
+        async def _scan_one(repo_key: str, repo_result: RepoResult) -> None:
+            if not repo_result.path_valid:
+                logger.warning("Repository path not found for %s, skipping security scan", repo_key)
+                return
+            repo_path = getattr(self._repo_data(repo_result), 'path', None)
+            async with semaphore:
+                security_result = await self._run_blocking(
+                    self.security_agent.analyze_repository,
+                    repo_path=repo_path,
+                    repo_name=repo_key,
+                    analysis_run_id=analysis_run_id,
+                )
+            serialized = security_result.to_dict()
+            security_results[repo_key] = serialized
+            logger.info(
+                "Security scan for %s: %s vulnerabilities found (%s critical)",
+                repo_key,
+                security_result.summary.get('total_vulnerabilities', 0),
+                security_result.summary.get('critical', 0),
+            )
 
-        except Exception as e:
-            logger.error("Security analysis failed: %s", e)
-            errors.append(f"Security analysis failed: {e}")
+        outcomes = await asyncio.gather(
+            *(_scan_one(k, r) for k, r in per_repo_results.items()),
+            return_exceptions=True,
+        )
+        for repo_key, outcome in zip(per_repo_results, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error("Security scan failed for %s: %s", repo_key, outcome)
+                errors.append(f"Security scan failed for {repo_key}: {outcome}")
 
         return {
             "current_step": "analyze_security",
-            "per_repo_results": per_repo_results,
             "security_results": security_results,
             "errors": errors,
         }
 
+    @_timed('analyze_repositories')
     async def _analyze_repositories(self, state: GraphState) -> GraphState:
         """Analyze repositories for pain points"""
-        logger.info("Step: Analyze repositories")
-        errors = list(state.get("errors", []))
-        per_repo_results = {
-            key: value.copy() if isinstance(value, dict) else value
-            for key, value in state.get("per_repo_results", {}).items()
-        }
-
-        try:
-            for repo_key, repo_result in per_repo_results.items():
-                repo_data = repo_result.get('repository_data')
-                if not repo_data:
-                    continue
+        logger.info("Step: Analyze repositories", extra=self._extra('analyze_repositories'))
+        errors: List[str] = []
+        per_repo_results = state.get("per_repo_results", {})
+        updates: Dict[str, RepoResult] = {}
+
+        semaphore = asyncio.Semaphore(self.max_concurrent_runs)
+        log_entries: List[Dict[str, Any]] = []
+        # One timestamp per node run; per-repo timestamps added no information
+        step_ts = datetime.now(timezone.utc).isoformat()
+
+        async def _analyze_one(repo_key: str, repo_result: RepoResult) -> None:
+            repo_data = self._repo_data(repo_result)
+            if not repo_data:
+                return
+
+            cache_key = self._pain_point_cache_key(repo_key, repo_data)
+            analysis_response = self._pain_point_cache.get(cache_key)
+            if analysis_response is None:
+                analysis_response = await self._load_cached_analysis(cache_key)
+            if analysis_response is None:
+                async with semaphore:
+                    analysis_response = await self._run_blocking(
+                        self.model_manager.analyze_pain_points,
+                        repo_result.summary,
+                        repo_data.open_prs,
+                    )
+                self._pain_point_cache[cache_key] = analysis_response
+                await self._store_cached_analysis(cache_key, analysis_response)
+            else:
+                logger.info("Pain-point cache hit for %s", repo_key)
+
+            _apply_response(repo_key, analysis_response)
+
+        def _apply_response(repo_key: str, analysis_response: Any) -> None:
+            pain_points = analysis_response.metadata.get('pain_points', []) if analysis_response.metadata else []
+            analysis_results = {
+                'repository': repo_key,
+                'pain_points': pain_points,
+                'severity_score': _score_pain_points(pain_points, analysis_response.confidence),
+                'confidence': analysis_response.confidence,
+                'model_used': analysis_response.model,
+                'solutions': [],
+            }
+            updates[repo_key] = RepoResult(repository_data=None, analysis_results=analysis_results)
 
-                insights_data = {
-                    'repository': {
-                        'name': repo_data.name,
-                        'owner': repo_data.owner,
-                        'health_score': repo_data.health_score,
-                        'open_prs': repo_data.open_prs,
-                        'ci_status': repo_data.ci_status,
-                    }
-                }
+            logger.info("Analyzed repository %s", repo_key)
 
-                analysis_response = self.model_manager.analyze_pain_points(
-                    insights_data['repository'],
-                    repo_data.open_prs,
+            if self.output_agent.log_enabled:
+                pain_point_block = "\n".join(
+                    f"- {p.get('type', 'unknown')} (severity {p.get('severity', '?')}) - {p.get('description', '')}"
+                    for p in pain_points
                 )
+                log_entries.append({
+                    'agent_name': 'structure_architecture',
+                    'repo_name': repo_key,
+                    'content': _ANALYSIS_LOG_TMPL.format(
+                        repo=repo_key,
+                        ts=step_ts,
+                        model=analysis_response.model,
+                        confidence=analysis_response.confidence,
+                        pain_point_block=pain_point_block,
+                    ),
+                    'json_payload': {'analysis_results': analysis_results},
+                })
 
-                repo_result['analysis_results'] = {
-                    'repository': repo_key,
-                    'pain_points': analysis_response.metadata.get('pain_points', []) if analysis_response.metadata else [],
-                    'confidence': analysis_response.confidence,
-                    'model_used': analysis_response.model,
-                    'solutions': [],
-                }
-
-                logger.info("Analyzed repository %s", repo_key)
+        batch_mode = (
+            self.config.get('agents', {})
+            .get('pain_point_analyzer', {})
+            .get('batch_mode', False)
+        )
 
-                lines = [
-                    "Agent: structure_architecture",
-                    f"Repository: {repo_key}",
-                    f"Timestamp: {datetime.now(timezone.utc).isoformat()}",
-                    "",
-                    f"Model: {repo_result['analysis_results']['model_used']} (confidence {repo_result['analysis_results']['confidence']:.2f})",
-                    "",
-                    "Identified Pain Points:",
-                ]
-                for p in repo_result['analysis_results']['pain_points']:
-                    lines.append(f"- {p.get('type','unknown')} (severity {p.get('severity','?')}) - {p.get('description','')}")
-                content = "\n".join(lines)
-                self.output_agent.write_agent_log(
-                    'structure_architecture',
-                    repo_key,
-                    content,
-                    json_payload={'analysis_results': repo_result['analysis_results']},
+        if batch_mode and len(per_repo_results) > 1:
+            # One prompt covering the whole run: a single round-trip instead
+            # of N. ModelManager falls back to per-repo calls internally if
+            # the batched response cannot be parsed.
+            batch_targets = []
+            batch_payloads = []
+            for repo_key, repo_result in per_repo_results.items():
+                repo_data = self._repo_data(repo_result)
+                if not repo_data:
+                    continue
+                batch_targets.append((repo_key, repo_result))
+                batch_payloads.append({
+                    'repository': repo_result.summary,
+                    'pull_requests': repo_data.open_prs,
+                })
+            try:
+                responses = await self._run_blocking(
+                    self.model_manager.analyze_pain_points_batch, batch_payloads
                 )
+                for (repo_key, repo_result), analysis_response in zip(batch_targets, responses):
+                    _apply_response(repo_key, analysis_response)
+            except Exception as e:
+                errors.append(f"Batched repository analysis failed: {e}")
+        else:
+            # Fan out so per-repo LLM calls overlap; wall time becomes the max
+            # of per-repo latencies instead of their sum
+            outcomes = await asyncio.gather(
+                *(_analyze_one(repo_key, repo_result) for repo_key, repo_result in per_repo_results.items()),
+                return_exceptions=True,
+            )
+            for repo_key, outcome in zip(per_repo_results, outcomes):
+                if isinstance(outcome, Exception):
+                    errors.append(f"Repository analysis failed for {repo_key}: {outcome}")
 
-        except Exception as e:
-            errors.append(f"Repository analysis failed: {e}")
+        # One batched write per node instead of one write per repo
+        if log_entries:
+            await self._run_blocking(self.output_agent.write_agent_logs_batch, log_entries)
 
         return {
             "current_step": "analyze_repositories",
-            "per_repo_results": per_repo_results,
+            "per_repo_results": updates,
             "errors": errors,
         }
     
+    @_timed('generate_visualizations')
     async def _generate_visualizations(self, state: GraphState) -> GraphState:
         """Generate visualizations for analysis results"""
-        logger.info("Step: Generate visualizations")
+        logger.info("Step: Generate visualizations", extra=self._extra('generate_visualizations'))
 
-        errors = list(state.get("errors", []))
+        errors: List[str] = []
         metrics = state.get("metrics", {})
         analysis_run_id = metrics.get('analysis_run_id')
-        per_repo_results = {
-            key: value.copy() if isinstance(value, dict) else value
-            for key, value in state.get("per_repo_results", {}).items()
-        }
+        updates: Dict[str, RepoResult] = {}
+
+        # Only repos that produced analysis results are worth visualizing
+        viable = [
+            (repo_key, repo_result)
+            for repo_key, repo_result in state.get("per_repo_results", {}).items()
+            if repo_result.analysis_results
+        ]
 
+        log_entries: List[Dict[str, Any]] = []
+        step_ts = datetime.now(timezone.utc).isoformat()
         try:
-            for repo_key, repo_result in per_repo_results.items():
-                analysis_results = repo_result.get('analysis_results', {})
-                if not analysis_results:
-                    continue
+            for repo_key, repo_result in viable:
+                analysis_results = repo_result.analysis_results
 
                 insights_data = {
                     'repository': analysis_results.get('repository', {}),
                     'pain_points': analysis_results.get('pain_points', []),
                 }
 
-                viz_results = self.viz_agent.generate_visualizations(
+                viz_results = await self._run_blocking(
+                    self.viz_agent.generate_visualizations,
                     analysis_run_id,
                     insights_data,
                     analysis_results.get('repository'),
                 )
 
-                repo_result['visualizations'] = viz_results
+                viz_ref = f"{analysis_run_id}:{repo_key}:viz"
+                self._blob_store[viz_ref] = viz_results
+                updates[repo_key] = RepoResult(repository_data=None, visualizations=viz_ref)
                 logger.info("Generated %d visualizations for %s", len(viz_results), repo_key)
 
+                if not self.output_agent.log_enabled:
+                    continue
+
                 lines = [
                     "Agent: visualization",
                     f"Repository: {repo_key}",
-                    f"Timestamp: {datetime.now(timezone.utc).isoformat()}",
+                    f"Timestamp: {step_ts}",
                     "",
                     "Generated Visualizations:",
                 ]
                 for v in viz_results:
                     lines.append(f"- {v.type}: {v.title} -> {v.filename}")
-                content = "\n".join(lines)
-                self.output_agent.write_agent_log(
-                    'visualization',
-                    repo_key,
-                    content,
-                    json_payload={
+                log_entries.append({
+                    'agent_name': 'visualization',
+                    'repo_name': repo_key,
+                    'content': "\n".join(lines),
+                    'json_payload': {
                         'visualizations': [
                             {
                                 'type': v.type,
@@ -579,62 +1302,67 @@ class RepositoryAnalysisGraph:
                             for v in viz_results
                         ]
                     },
-                )
+                })
+
+            if log_entries:
+                await self._run_blocking(self.output_agent.write_agent_logs_batch, log_entries)
 
         except Exception as e:
             errors.append(f"Visualization generation failed: {e}")
 
         return {
             "current_step": "generate_visualizations",
-            "per_repo_results": per_repo_results,
+            "per_repo_results": updates,
             "errors": errors,
         }
     
+    @_timed('generate_report')
     async def _generate_report(self, state: GraphState) -> GraphState:
         """Generate analysis report"""
-        logger.info("Step: Generate report")
+        logger.info("Step: Generate report", extra=self._extra('generate_report'))
 
-        errors = list(state.get("errors", []))
+        errors: List[str] = []
         summary = dict(state.get("summary", {}))
         metrics = state.get("metrics", {})
 
         try:
             analysis_run_id = metrics.get('analysis_run_id')
 
-            repositories = []
-            analysis_results = []
-            visualizations = []
-            solutions = []
-
-            for repo_key, repo_result in state.get("per_repo_results", {}).items():
-                repo_data = repo_result.get('repository_data', {})
-                analysis = repo_result.get('analysis_results', {})
-                vizs = repo_result.get('visualizations', [])
-
-                repositories.append({
-                    'name': repo_data.name,
-                    'owner': repo_data.owner,
-                    'health_score': repo_data.health_score,
-                    'open_prs': repo_data.open_prs,
-                    'ci_status': repo_data.ci_status,
-                })
-
-                analysis_results.append(analysis)
-
-                for viz in vizs:
-                    visualizations.append({
+            # Single pass over per_repo_results with bound append/extend
+            # locals; projections hold references, not copies
+            repositories: List[Dict[str, Any]] = []
+            analysis_results: List[Dict[str, Any]] = []
+            visualizations: List[Dict[str, Any]] = []
+            solutions: List[Dict[str, Any]] = []
+            repos_append = repositories.append
+            ana_append = analysis_results.append
+            viz_extend = visualizations.extend
+            sol_extend = solutions.extend
+
+            for repo_result in state.get("per_repo_results", {}).values():
+                if repo_result.summary is None:
+                    continue
+                repos_append(repo_result.summary)
+                analysis = repo_result.analysis_results or {}
+                ana_append(analysis)
+                viz_extend(
+                    {
                         'type': viz.type,
                         'title': viz.title,
                         'filename': viz.filename,
                         'mermaid_code': viz.mermaid_code,
                         'description': viz.metadata.get('description', ''),
-                    })
-
-                for pain_point in analysis.get('pain_points', []):
-                    if pain_point.get('recommendations'):
-                        solutions.extend(pain_point['recommendations'])
-
-            report_path = self.output_agent.generate_analysis_report(
+                    }
+                    for viz in (self._viz_results(repo_result) or ())
+                )
+                sol_extend(itertools.chain.from_iterable(
+                    pain_point['recommendations']
+                    for pain_point in analysis.get('pain_points', ())
+                    if pain_point.get('recommendations')
+                ))
+
+            report_path = await self._run_blocking(
+                self.output_agent.generate_analysis_report,
                 analysis_run_id,
                 repositories,
                 analysis_results,
@@ -655,10 +1383,11 @@ class RepositoryAnalysisGraph:
             "errors": errors,
         }
 
+    @_timed('review_pull_requests')
     async def _review_pull_requests(self, state: GraphState) -> GraphState:
         """Run programmatic PR reviews when enabled"""
-        logger.info("Step: Review pull requests")
-        errors = list(state.get("errors", []))
+        logger.info("Step: Review pull requests", extra=self._extra('review_pull_requests'))
+        errors: List[str] = []
         metrics = state.get("metrics", {})
 
         try:
@@ -666,13 +1395,26 @@ class RepositoryAnalysisGraph:
             if not getattr(self.pr_agent, 'enabled', False):
                 logger.info("PR review disabled; skipping")
             else:
-                for repo_key in state.get("per_repo_results", {}).keys():
-                    parts = repo_key.split('/')
-                    if len(parts) != 2:
-                        continue
-                    owner, name = parts
-                    count = self.pr_agent.review_repo(owner, name, analysis_run_id)
+                # Reviews are GitHub + LLM round-trips; overlap them under a
+                # bound that respects the API rate limit
+                semaphore = asyncio.Semaphore(self.graph_config.get('pr_concurrency', 8))
+
+                async def _review_one(repo_key: str, repo_result: RepoResult) -> None:
+                    async with semaphore:
+                        count = await self._run_blocking(
+                            self.pr_agent.review_repo,
+                            repo_result.owner, repo_result.name, analysis_run_id,
+                        )
                     logger.info("Reviewed %d open PRs for %s", count, repo_key)
+
+                per_repo_results = state.get("per_repo_results", {})
+                outcomes = await asyncio.gather(
+                    *(_review_one(k, r) for k, r in per_repo_results.items()),
+                    return_exceptions=True,
+                )
+                for repo_key, outcome in zip(per_repo_results, outcomes):
+                    if isinstance(outcome, Exception):
+                        errors.append(f"PR review failed for {repo_key}: {outcome}")
         except Exception as e:
             errors.append(f"PR review failed: {e}")
 
@@ -681,30 +1423,62 @@ class RepositoryAnalysisGraph:
             "errors": errors,
         }
     
+    @_timed('finalize')
     async def _finalize_analysis(self, state: GraphState) -> GraphState:
         """Finalize the analysis workflow"""
-        logger.info("Step: Finalize analysis")
+        logger.info("Step: Finalize analysis", extra=self._extra('finalize'))
 
-        errors = list(state.get("errors", []))
-        metrics = dict(state.get("metrics", {}))
+        errors: List[str] = []
+        metrics: Dict[str, Any] = {}
+        run_errors = state.get("errors", []) or []
 
         try:
-            analysis_run_id = metrics.get('analysis_run_id')
+            analysis_run_id = state.get("metrics", {}).get('analysis_run_id')
 
             if analysis_run_id:
-                if errors:
-                    self.storage.update_analysis_run_status(
+                if run_errors:
+                    status_args = ('failed', f"Errors: {'; '.join(run_errors)}")
+                else:
+                    status_args = ('completed',)
+                status_task = asyncio.create_task(
+                    self._run_blocking(
+                        self.storage.update_analysis_run_status,
                         analysis_run_id,
-                        'failed',
-                        f"Errors: {'; '.join(errors)}",
+                        *status_args,
                     )
-                else:
-                    self.storage.update_analysis_run_status(
+                )
+                self._bg_tasks.add(status_task)
+                status_task.add_done_callback(self._bg_tasks.discard)
+                try:
+                    # Bounded wait: a slow database should not hold run
+                    # completion hostage; the shielded task finishes the
+                    # write in the background if the window elapses
+                    await asyncio.wait_for(asyncio.shield(status_task), timeout=5.0)
+                except asyncio.TimeoutError:
+                    logger.warning(
+                        "Run status update for %s still pending after 5s; continuing in background",
                         analysis_run_id,
-                        'completed',
                     )
 
-            self.output_agent.cleanup_old_reports()
+            if not run_errors:
+                # Record analyzed SHAs so incremental runs can skip unchanged repos
+                await self._run_blocking(
+                    self.repo_manager.save_analyzed_shas, state.get("head_shas", {})
+                )
+
+            # Old-report cleanup is housekeeping; run it off the critical
+            # path so the run's completion isn't delayed by filesystem scans
+            cleanup_task = asyncio.create_task(
+                self._run_blocking(self.output_agent.cleanup_old_reports)
+            )
+            self._bg_tasks.add(cleanup_task)
+            cleanup_task.add_done_callback(self._bg_tasks.discard)
+
+            # Release this run's repository blobs now that reporting is done
+            run_prefix = f"{analysis_run_id}:"
+            for blob_id in [k for k in self._blob_store if k.startswith(run_prefix)]:
+                self._blob_store.pop(blob_id, None)
+
             metrics['completed_at'] = datetime.now(timezone.utc).isoformat()
             logger.info("Analysis finalized successfully")
 
@@ -717,6 +1491,28 @@ class RepositoryAnalysisGraph:
             "metrics": metrics,
         }
     
+    def _cached_stat(self, key: str, fn):
+        """Return fn() memoized for stats_cache_ttl seconds"""
+        now = time.monotonic()
+        entry = self._stats_cache.get(key)
+        if entry is not None and now - entry[0] < self._stats_cache_ttl:
+            return entry[1]
+        value = fn()
+        self._stats_cache[key] = (now, value)
+        return value
+
+    def _fast_get_state(self, config: Dict[str, Any]):
+        """Read the latest checkpoint tuple directly from the checkpointer.
+
+        graph.get_state reconstructs a full StateSnapshot per call;
+        checkpointer.get_tuple skips that and is the right primitive for
+        monitoring and retry loops. Keep get_state for human-facing APIs.
+        """
+        checkpointer = getattr(self, '_checkpointer', None)
+        if checkpointer is None:
+            return None
+        return checkpointer.get_tuple(config)
+
     def get_graph_stats(self) -> Dict[str, Any]:
         """Get statistics about the graph configuration"""
         return {
@@ -725,24 +1521,27 @@ class RepositoryAnalysisGraph:
             "timeout_seconds": self.timeout_seconds,
             "retry_attempts": self.retry_attempts,
             "supported_repos": self.data_agent.default_owner,
-            "model_stats": self.model_manager.get_model_stats()
+            "model_stats": self._cached_stat('model_stats', self.model_manager.get_model_stats),
+            "checkpointer": type(getattr(self, '_checkpointer', None)).__name__,
         }
     
     def health_check(self) -> Dict[str, Any]:
         """Perform health check on the orchestration system"""
+        # One timestamp per check, shared by success and failure payloads
+        now_iso = datetime.now(timezone.utc).isoformat()
         try:
             # Check storage health
-            storage_health = self.storage.health_check()
+            storage_health = self._cached_stat('storage_health', self.storage.health_check)
             
             # Check model availability
-            model_stats = self.model_manager.get_model_stats()
+            model_stats = self._cached_stat('model_stats', self.model_manager.get_model_stats)
             
             # Check output configuration
-            output_stats = self.output_agent.get_output_stats()
+            output_stats = self._cached_stat('output_stats', self.output_agent.get_output_stats)
             
             return {
                 "status": "healthy" if storage_health.get("status") == "healthy" else "degraded",
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": now_iso,
                 "components": {
                     "storage": storage_health,
                     "models": model_stats,
@@ -754,6 +1553,6 @@ class RepositoryAnalysisGraph:
         except Exception as e:
             return {
                 "status": "unhealthy",
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": now_iso,
                 "error": str(e)
             }
\ No newline at end of file
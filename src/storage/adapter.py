@@ -181,6 +181,13 @@ class Visualization(Base):
     # Relationships
     run = relationship("AnalysisRun", back_populates="visualizations")
 
+class LlmCache(Base):
+    __tablename__ = 'llm_cache'
+
+    key = Column(String(64), primary_key=True)
+    response = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
 @dataclass
 class DatabaseConfig:
     """Database configuration"""
@@ -430,6 +437,36 @@ class StorageAdapter:
             session.refresh(recommendation)
             return recommendation
     
+    def bulk_create_pain_points(self, run_id: int, entries: List[Dict[str, Any]]) -> int:
+        """Persist many pain points and their recommendations in one transaction.
+
+        Each entry carries the create_pain_point fields plus an optional
+        'recommendations' list of texts. One session/commit replaces the
+        2-per-row round-trips of the per-item creators.
+        """
+        if not entries:
+            return 0
+        with self.get_session() as session:
+            for entry in entries:
+                pain_point = PainPoint(
+                    run_id=run_id,
+                    pr_id=entry.get('pr_id'),
+                    type=entry['pain_type'],
+                    severity=entry['severity'],
+                    description=entry['description'],
+                    raw_context=entry.get('raw_context'),
+                    confidence_score=entry.get('confidence_score'),
+                )
+                session.add(pain_point)
+                recommendations = entry.get('recommendations') or []
+                if recommendations:
+                    session.flush()
+                    session.add_all([
+                        Recommendation(pain_point_id=pain_point.id, text=text)
+                        for text in recommendations
+                    ])
+            return len(entries)
+
     def get_recommendations_by_pain_point(self, pain_point_id: int) -> List[Recommendation]:
         """Get recommendations for a pain point"""
         with self.get_session() as session:
@@ -464,6 +501,29 @@ class StorageAdapter:
                 Visualization.run_id == run_id
             ).order_by(Visualization.type).all()
     
+    # LLM Response Cache
+    def get_llm_cache(self, key: str, ttl_seconds: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Fetch a cached LLM response by content hash, honoring an optional TTL"""
+        with self.get_session() as session:
+            entry = session.query(LlmCache).filter(LlmCache.key == key).first()
+            if entry is None:
+                return None
+            if ttl_seconds is not None and entry.created_at is not None:
+                age = (datetime.now(timezone.utc) - entry.created_at).total_seconds()
+                if age > ttl_seconds:
+                    return None
+            return entry.response
+
+    def put_llm_cache(self, key: str, response: Dict[str, Any]) -> None:
+        """Store an LLM response under its content hash (upsert)"""
+        with self.get_session() as session:
+            entry = session.get(LlmCache, key)
+            if entry is None:
+                session.add(LlmCache(key=key, response=response))
+            else:
+                entry.response = response
+                entry.created_at = datetime.now(timezone.utc)
+
     # Health and Monitoring
     def health_check(self) -> Dict[str, Any]:
         """Perform database health check"""
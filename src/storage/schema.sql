@@ -129,6 +129,13 @@ CREATE TABLE visualizations (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Cached LLM responses keyed by a hash of their inputs
+CREATE TABLE llm_cache (
+    key VARCHAR(64) PRIMARY KEY,
+    response JSONB NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
 -- System metrics and monitoring
 CREATE TABLE system_metrics (
     id SERIAL PRIMARY KEY,
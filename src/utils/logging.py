@@ -3,17 +3,71 @@ Logging Setup
 Enhanced logging configuration for the new architecture
 """
 
+import json
 import logging
 import sys
 import uuid
 import functools
 import time
 from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
 from typing import Optional
 
+# orjson formats structured records noticeably faster than stdlib json;
+# fall back to the stdlib when it is not installed
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+# Attributes present on every LogRecord; anything else came in via extra=
+_STANDARD_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+
+# Correlation ID for the current execution context; log records pick it up
+# through CorrelationIdFilter instead of per-call extra= dicts
+_correlation_id_var: ContextVar[Optional[str]] = ContextVar('correlation_id', default=None)
+
+
+class CorrelationIdFilter(logging.Filter):
+    """Stamp each record with the ContextVar correlation ID when one is set."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, 'correlation_id'):
+            cid = _correlation_id_var.get()
+            if cid is not None:
+                record.correlation_id = cid
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Render log records as one JSON object per line.
+
+    Timestamps come from record.created directly (no datetime allocation)
+    and any extra= fields are merged into the payload, so structured
+    handlers see step/component/correlation_id without string parsing.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            'ts': record.created,
+            'lvl': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_RECORD_ATTRS and not key.startswith('_'):
+                payload[key] = value
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        if orjson is not None:
+            return orjson.dumps(payload, default=str).decode()
+        return json.dumps(payload, default=str)
+
+
 def setup_logging(level: str | int = "INFO", log_file: Optional[str] = None, 
-                 log_format: Optional[str] = None) -> None:
+                 log_format: Optional[str] = None, json_logs: bool = False) -> None:
     """Setup enhanced logging configuration"""
     
     # Default log format
@@ -59,8 +113,17 @@ def setup_logging(level: str | int = "INFO", log_file: Optional[str] = None,
     for name, logger in loggers.items():
         logger.setLevel(resolved_level)
     
+    correlation_filter = CorrelationIdFilter()
+    for handler in logging.root.handlers:
+        handler.addFilter(correlation_filter)
+
+    if json_logs:
+        formatter = JsonFormatter()
+        for handler in logging.root.handlers:
+            handler.setFormatter(formatter)
+
     # Add console colors for different levels
-    if sys.stdout.isatty():
+    if not json_logs and sys.stdout.isatty():
         from logging import StreamHandler, Formatter
         
         class ColoredFormatter(Formatter):
@@ -99,12 +162,23 @@ def get_logger(name: str | None = None) -> logging.Logger:
 
 @contextmanager
 def correlation_context(run_id: str | None = None):
-    """Context manager that yields a correlation ID for structured logs."""
+    """Context manager that yields a correlation ID for structured logs.
+
+    The ID is published through a ContextVar so CorrelationIdFilter can
+    attach it to every record emitted inside the block without callers
+    threading it through extra= dicts.
+    """
     run_id = run_id or str(uuid.uuid4())
+    token = _correlation_id_var.set(run_id)
     try:
         yield run_id
     finally:
-        pass
+        _correlation_id_var.reset(token)
+
+
+def current_correlation_id() -> Optional[str]:
+    """Return the correlation ID of the active context, if any."""
+    return _correlation_id_var.get()
 
 
 def timer_decorator(func):
@@ -0,0 +1,46 @@
+"""
+Unit tests for pain-point severity scoring
+"""
+
+import unittest
+
+from src.orchestration.graph import _score_pain_points
+
+
+class TestScorePainPoints(unittest.TestCase):
+    """Test cases for _score_pain_points"""
+
+    def test_empty_pain_points(self):
+        """No pain points yields a zero score"""
+        self.assertEqual(_score_pain_points([], 1.0), 0.0)
+
+    def test_numeric_severity_1_to_5_scale(self):
+        """Numeric severities follow the 1-5 scale the prompts request"""
+        self.assertAlmostEqual(_score_pain_points([{'severity': 1}], 1.0), 0.2)
+        self.assertAlmostEqual(_score_pain_points([{'severity': 3}], 1.0), 0.6)
+        self.assertAlmostEqual(_score_pain_points([{'severity': 5}], 1.0), 1.0)
+
+    def test_numeric_severity_out_of_range_clamped(self):
+        """Severities outside 0-5 clamp to the scale bounds"""
+        self.assertAlmostEqual(_score_pain_points([{'severity': 9}], 1.0), 1.0)
+        self.assertAlmostEqual(_score_pain_points([{'severity': -2}], 1.0), 0.0)
+
+    def test_label_severity_weights(self):
+        """String labels map through the fixed weight table"""
+        self.assertAlmostEqual(_score_pain_points([{'severity': 'critical'}], 1.0), 1.0)
+        self.assertAlmostEqual(_score_pain_points([{'severity': 'low'}], 1.0), 0.25)
+        self.assertAlmostEqual(_score_pain_points([{'severity': 'unknown-label'}], 1.0), 0.5)
+
+    def test_confidence_scales_score(self):
+        """Confidence multiplies the averaged severity"""
+        self.assertAlmostEqual(_score_pain_points([{'severity': 5}], 0.5), 0.5)
+        self.assertAlmostEqual(
+            _score_pain_points([{'severity': 1}, {'severity': 5}], 1.0), 0.6)
+
+    def test_missing_severity_defaults_to_medium(self):
+        """Points without a severity fall back to the medium weight"""
+        self.assertAlmostEqual(_score_pain_points([{}], 1.0), 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
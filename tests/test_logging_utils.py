@@ -0,0 +1,48 @@
+"""
+Unit tests for structured logging utilities.
+"""
+import json
+import logging
+
+from src.utils.logging import JsonFormatter
+
+
+def _make_record(msg: str, **extra) -> logging.LogRecord:
+    record = logging.LogRecord('test', logging.INFO, 'file.py', 1, msg, (), None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+def test_json_formatter_emits_core_fields():
+    line = JsonFormatter().format(_make_record('hello'))
+    payload = json.loads(line)
+    assert payload['msg'] == 'hello'
+    assert payload['lvl'] == 'INFO'
+    assert payload['logger'] == 'test'
+    assert isinstance(payload['ts'], float)
+
+
+def test_json_formatter_includes_extra_fields():
+    record = _make_record('step start', step='sync_repositories', component='Graph')
+    payload = json.loads(JsonFormatter().format(record))
+    assert payload['step'] == 'sync_repositories'
+    assert payload['component'] == 'Graph'
+
+
+def test_correlation_context_publishes_contextvar():
+    from src.utils.logging import (
+        CorrelationIdFilter,
+        correlation_context,
+        current_correlation_id,
+    )
+
+    assert current_correlation_id() is None
+    with correlation_context('run-42') as cid:
+        assert cid == 'run-42'
+        assert current_correlation_id() == 'run-42'
+
+        record = _make_record('inside context')
+        assert CorrelationIdFilter().filter(record)
+        assert record.correlation_id == 'run-42'
+    assert current_correlation_id() is None
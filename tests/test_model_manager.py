@@ -0,0 +1,121 @@
+"""
+Unit tests for the ModelManager request handling paths.
+"""
+import json
+import threading
+from unittest.mock import patch
+
+from src.models.model_manager import ModelManager, ModelResponse
+
+
+def _make_manager() -> ModelManager:
+    return ModelManager({
+        'models': {
+            'glm_4_6': {'model': 'glm-4.6', 'max_tokens': 4000},
+        },
+        'api_keys': {'glm_api_key': 'test-key'},
+    })
+
+
+def test_request_key_is_stable_per_model_and_prompt():
+    manager = _make_manager()
+    key_a = manager._request_key('glm_4_6', 'prompt one')
+    key_b = manager._request_key('glm_4_6', 'prompt one')
+    key_c = manager._request_key('glm_4_6', 'prompt two')
+    assert key_a == key_b
+    assert key_a != key_c
+
+
+def test_second_caller_awaits_inflight_future():
+    manager = _make_manager()
+    key = manager._request_key('glm_4_6', 'same prompt')
+
+    # Simulate a first caller already mid-flight for the same request
+    from concurrent.futures import Future
+    inflight = Future()
+    manager._inflight[key] = inflight
+    inflight.set_result(ModelResponse(content='shared', model='glm-4.6'))
+
+    with patch.object(manager, '_call_with_fallback') as mock_call:
+        result = manager.call_model('glm_4_6', 'same prompt')
+
+    mock_call.assert_not_called()
+    assert result.content == 'shared'
+
+
+def test_inflight_entry_removed_after_completion():
+    manager = _make_manager()
+    with patch.object(manager, '_call_with_fallback', return_value=ModelResponse(content='x', model='glm-4.6')):
+        manager.call_model('glm_4_6', 'prompt')
+    assert manager._inflight == {}
+
+
+def test_trim_to_token_budget_leaves_short_text_alone():
+    from src.models.model_manager import trim_to_token_budget
+    assert trim_to_token_budget('short text', 100) == 'short text'
+    assert trim_to_token_budget(None, 100) == ''
+
+
+def test_trim_to_token_budget_shrinks_long_text():
+    from src.models.model_manager import trim_to_token_budget
+    long_text = 'word ' * 5000
+    trimmed = trim_to_token_budget(long_text, 50)
+    assert len(trimmed) < len(long_text)
+
+
+def test_pain_point_prompt_bounds_pr_descriptions():
+    manager = _make_manager()
+    prs = [{'title': 'Fix bug', 'description': 'body ' * 5000}]
+    prompt = manager._build_pain_point_prompt({'name': 'repo', 'owner': 'me'}, prs)
+    assert len(prompt) < 20000
+
+
+def test_parse_response_salvages_missing_content():
+    import pytest
+    manager = _make_manager()
+    response = {'choices': [{'message': {'content': None}}], 'usage': {'total_tokens': 12}}
+
+    degraded = manager._parse_response(response, 'glm-4.6')
+    assert degraded.confidence == 0.1
+    assert degraded.metadata['warning'] == 'schema_mismatch'
+    assert degraded.tokens_used == 12
+
+    with pytest.raises(RuntimeError):
+        manager._parse_response(response, 'glm-4.6', strict=True)
+
+
+def test_parse_batch_pain_points_splits_per_repo():
+    manager = _make_manager()
+    content = json.dumps({
+        'repositories': [
+            {'repository': 'o/a', 'pain_points': [{'type': 'ci', 'severity': 3}], 'confidence': 0.9},
+            {'repository': 'o/b', 'pain_points': [], 'confidence': 0.5},
+        ]
+    })
+    response = ModelResponse(content=content, model='glm-4.6', tokens_used=200)
+    parsed = manager._parse_batch_pain_points(response, expected=2)
+    assert len(parsed) == 2
+    assert parsed[0].metadata['pain_points'] == [{'type': 'ci', 'severity': 3}]
+    assert parsed[0].confidence == 0.9
+    assert parsed[1].metadata['repository'] == 'o/b'
+
+
+def test_parse_batch_pain_points_rejects_count_mismatch():
+    manager = _make_manager()
+    response = ModelResponse(content=json.dumps({'repositories': [{}]}), model='glm-4.6')
+    assert manager._parse_batch_pain_points(response, expected=2) is None
+
+
+def test_batch_falls_back_to_per_repo_on_unparseable_content():
+    manager = _make_manager()
+    manager.call_model = lambda *a, **kw: ModelResponse(content='not json', model='glm-4.6')
+    per_repo_calls = []
+    manager.analyze_pain_points = lambda repo, prs=None: per_repo_calls.append(repo) or ModelResponse(
+        content='{}', model='glm-4.6'
+    )
+    results = manager.analyze_pain_points_batch([
+        {'repository': {'name': 'a', 'owner': 'o'}},
+        {'repository': {'name': 'b', 'owner': 'o'}},
+    ])
+    assert len(results) == 2
+    assert len(per_repo_calls) == 2
@@ -0,0 +1,42 @@
+"""
+Unit tests for RepoManager sync state handling.
+"""
+import os
+import tempfile
+
+from src.repo_manager import RepoManager
+
+
+def _make_manager(workspace: str) -> RepoManager:
+    return RepoManager({'repositories': {'workspace_path': workspace, 'default_owner': 'owner'}})
+
+
+def test_analyzed_shas_round_trip():
+    workspace = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(workspace)
+    try:
+        manager = _make_manager(workspace)
+        assert manager.load_last_analyzed_shas() == {}
+
+        manager.save_analyzed_shas({'owner/repo-a': 'abc123'})
+        assert manager.load_last_analyzed_shas() == {'owner/repo-a': 'abc123'}
+
+        # Saving merges with previously recorded repos
+        manager.save_analyzed_shas({'owner/repo-b': 'def456'})
+        shas = manager.load_last_analyzed_shas()
+        assert shas == {'owner/repo-a': 'abc123', 'owner/repo-b': 'def456'}
+    finally:
+        os.chdir(cwd)
+
+
+def test_save_empty_shas_is_a_noop():
+    workspace = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(workspace)
+    try:
+        manager = _make_manager(workspace)
+        manager.save_analyzed_shas({})
+        assert not manager.analyzed_shas_path.exists()
+    finally:
+        os.chdir(cwd)